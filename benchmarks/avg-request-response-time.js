@@ -3,50 +3,201 @@
 // TODO: migrate to TypeScript via Deno 2?
 
 /**
- * Fetches data from an endpoint X times and tracks response times.
+ * Load-tests an endpoint and reports its response times.
+ *
+ * Usage:
+ *  - node benchmarks/avg-request-response-time.js
+ *  - node benchmarks/avg-request-response-time.js --requests 200 --concurrency 10 --rate 20 --warmup 5
+ *  - node benchmarks/avg-request-response-time.js --json .logs/benchmark.json  # to compare runs over time
+ */
+
+const { writeFile } = require('node:fs/promises');
+const { parseArgs } = require('node:util');
+
+/**
+ * @typedef {Object} LoadTestOptions
+ * @property {number} [concurrency] - How many requests may be in flight at once.
+ * @property {number} [rate] - Max requests started per second (unlimited if not set).
+ * @property {number} [warmup] - Requests to send (and ignore) before measuring, to warm up connections and caches.
+ */
+
+/**
+ * @typedef {Object} LoadTestResults
+ * @property {number[]} durations - Response time of every successful request, in ms.
+ * @property {Record<string, number>} statuses - Number of responses per status code.
+ * @property {number} errors - Requests that threw or returned a non-2xx status.
+ * @property {number} elapsed - Wall time of the measured requests, in ms.
+ */
+
+/**
+ * Fetches data from an endpoint X times (after any warmup requests) and tracks response times.
  *
  * @param {() => Promise<Response>} fetchCallback - The function to be called to fetch data.
  * @param {number} x - The number of times the fetch operation should be performed.
- * @returns {Promise<{averageResponseTime: number, errors: number}>} - The average response time and number of errors.
+ * @param {LoadTestOptions} [options]
+ * @returns {Promise<LoadTestResults>}
  */
-async function fetchFromEndpointXTimes(fetchCallback, x = 10) {
-  let totalDuration = 0;
-  let errors = 0;
+async function fetchFromEndpointXTimes(fetchCallback, x = 10, { concurrency = 1, rate, warmup = 0 } = {}) {
+  /** @type {LoadTestResults} */
+  const results = { durations: [], statuses: {}, errors: 0, elapsed: 0 };
 
   console.info() // blank line after prompt for better readability
 
-  for (let i = 0; i < x; i++) {
-    try {
-      const startTime = Date.now();
-      const response = await fetchCallback();
-      const endTime = Date.now();
+  for (let i = 0; i < warmup; i++) {
+    await fetchCallback().catch(() => {});
+  }
 
-      const duration = endTime - startTime;
-      totalDuration += duration;
+  const startTime = performance.now();
+  let next = 0;
 
-      console.info('Status:', response?.status, '/', 'Duration:', duration, 'ms', '/', 'Total queries:', i + 1, );
-      // console.info('Attempt', i + 1, 'Status:', response?.status, '/', 'Duration:', duration, 'ms', '/');
-    } catch (err) {
-      console.error('Error: ', err);
-      errors++;
+  /** Start each request no earlier than its slot, so the overall rate never exceeds `rate` requests/second */
+  async function waitForSlot(/** @type {number} */ i) {
+    if (!rate) return;
+    const delay = startTime + (i * 1000) / rate - performance.now();
+    if (delay > 0) await new Promise(resolve => setTimeout(resolve, delay));
+  }
+
+  async function worker() {
+    while (next < x) {
+      const i = next++;
+      await waitForSlot(i);
+
+      try {
+        const requestStart = performance.now();
+        const response = await fetchCallback();
+        await response.arrayBuffer(); // include the time it takes to read the body
+        const duration = performance.now() - requestStart;
+
+        results.statuses[response.status] = (results.statuses[response.status] ?? 0) + 1;
+
+        if (!response.ok) {
+          results.errors++;
+          continue;
+        }
+
+        results.durations.push(duration);
+        console.info('Status:', response.status, '/', 'Duration:', duration.toFixed(1), 'ms', '/', 'Total queries:', i + 1);
+      } catch (err) {
+        console.error('Error: ', err);
+        results.errors++;
+      }
     }
   }
 
+  await Promise.all(Array.from({ length: Math.max(1, concurrency) }, worker));
+  results.elapsed = performance.now() - startTime;
+
+  return results;
+}
+
+/**
+ * The smallest duration that at least p% of durations are at or below (nearest-rank method).
+ *
+ * @param {number[]} sorted - Durations in ascending order (at least one).
+ * @param {number} p - Percentile between 0 and 100.
+ */
+function percentile(sorted, p) {
+  return sorted[Math.max(0, Math.ceil((p / 100) * sorted.length) - 1)];
+}
+
+/**
+ * Groups durations into equal-width buckets between the fastest and slowest response.
+ *
+ * @param {number[]} sorted - Durations in ascending order.
+ * @param {number} buckets - Number of buckets.
+ * @returns {{from: number, to: number, count: number}[]}
+ */
+function histogram(sorted, buckets = 10) {
+  if (sorted.length === 0) return [];
+
+  const min = sorted[0];
+  const width = (sorted[sorted.length - 1] - min) / buckets || 1;
+  const counts = Array.from({ length: buckets }, (_, i) => ({ from: min + i * width, to: min + (i + 1) * width, count: 0 }));
+
+  for (const duration of sorted) {
+    counts[Math.min(buckets - 1, Math.floor((duration - min) / width))].count++;
+  }
+
+  return counts;
+}
+
+/**
+ * Latency and throughput cover successful requests only; errors are counted separately.
+ *
+ * @param {LoadTestResults} results
+ * @param {number} x - The number of measured requests.
+ */
+function summarize(results, x) {
+  const sorted = [...results.durations].sort((a, b) => a - b);
+  const round = (/** @type {number} */ n) => Math.round(n * 10) / 10;
+
   return {
-    averageResponseTime: totalDuration / x,
-    errors,
+    requests: x,
+    successes: sorted.length,
+    errors: results.errors,
+    errorRatePercent: round((results.errors / x) * 100),
+    statuses: results.statuses,
+    throughputPerSecond: results.elapsed > 0 ? round((sorted.length / results.elapsed) * 1000) : 0,
+    durationMs:
+      sorted.length === 0
+        ? null // no successful requests to measure
+        : {
+            min: round(sorted[0]),
+            mean: round(sorted.reduce((total, d) => total + d, 0) / sorted.length),
+            p50: round(percentile(sorted, 50)),
+            p90: round(percentile(sorted, 90)),
+            p99: round(percentile(sorted, 99)),
+            max: round(sorted[sorted.length - 1]),
+          },
+    histogram: histogram(sorted).map(({ from, to, count }) => ({ from: round(from), to: round(to), count })),
   };
 }
 
 // TODO: click "Copy as fetch (Node.js)" in the browser Network tab + paste here */
 const fetchCallback = () => fetch('...')
 
-const x = 50
+const { values: args } = parseArgs({
+  options: {
+    requests: { type: 'string', default: '50' },
+    concurrency: { type: 'string', default: '1' },
+    rate: { type: 'string' },
+    warmup: { type: 'string', default: '0' },
+    json: { type: 'string' },
+  },
+});
+
+const x = Number(args.requests);
+
+fetchFromEndpointXTimes(fetchCallback, x, {
+  concurrency: Number(args.concurrency),
+  rate: args.rate ? Number(args.rate) : undefined,
+  warmup: Number(args.warmup),
+})
+  .then(async results => {
+    const summary = summarize(results, x);
+    const { durationMs } = summary;
 
-fetchFromEndpointXTimes(fetchCallback, x)
-  .then(results => {
-    console.log('\nAverage response time:', results.averageResponseTime, 'ms');
-    console.log('Error rate:', results.errors / x, '%');
+    if (durationMs === null) {
+      console.log('\nResponse times (ms): none (no request succeeded)');
+    } else {
+      console.log('\nResponse times (ms):', `min ${durationMs.min} / mean ${durationMs.mean} / p50 ${durationMs.p50} / p90 ${durationMs.p90} / p99 ${durationMs.p99} / max ${durationMs.max}`);
+    }
+    console.log('Throughput:', summary.throughputPerSecond, 'successful req/s');
+    console.log('Error rate:', summary.errorRatePercent, '%', `(${summary.errors} of ${x})`);
+
+    if (summary.histogram.length > 0) {
+      const largest = Math.max(...summary.histogram.map(bucket => bucket.count));
+      console.log('\nHistogram (ms):');
+      for (const { from, to, count } of summary.histogram) {
+        const bar = '█'.repeat(Math.round((count / largest) * 40));
+        console.log(`${from.toFixed(1).padStart(8)} – ${to.toFixed(1).padEnd(8)} ${bar} ${count}`);
+      }
+    }
+
+    if (args.json) {
+      await writeFile(args.json, JSON.stringify({ date: new Date().toISOString(), ...summary }, null, 2));
+      console.log('\nSaved results to', args.json);
+    }
   })
   .catch(error => {
     console.error('An error occurred:', error);
@@ -0,0 +1,259 @@
+"""
+An in-memory stand-in for the parts of the Feedbin API these scripts use, served on localhost.
+
+Point the scripts at it by setting FEEDBIN_API before importing anything from rss/ (see rss/utils/feedbin.py):
+
+    with FakeFeedbin(FakeFeedbinConfig(latency=0.02)) as feedbin:
+        os.environ["FEEDBIN_API"] = feedbin.api
+        ...
+
+Behaves like Feedbin where the scripts depend on it (status codes, "links" pagination headers, `page` and `since`
+params), and can add latency, throttle a share of requests with 429s, and answer 300 Multiple Choices for
+subscription URLs containing "multiple".
+
+Docs:
+ - https://github.com/feedbin/feedbin-api
+ - https://docs.python.org/3/library/http.server.html#http.server.ThreadingHTTPServer
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Self
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+Seconds = float
+
+CREATED_AT_START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+@dataclass(frozen=True)
+class FakeFeedbinConfig:
+    latency: Seconds = 0.0  # added to every response
+    page_size: int = 100  # entries or subscriptions per page
+    entries_per_feed: int = 250
+    throttle_rate: float = 0.0  # share of requests (0 to 1) answered with 429 Too Many Requests
+    retry_after: Seconds = 0.0  # Retry-After sent with each 429
+    seed: int = 0
+
+
+def _created_at(n: int) -> str:
+    """A distinct, sortable ISO 8601 timestamp for the nth entry or subscription."""
+    return (CREATED_AT_START + timedelta(seconds=n)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class FakeFeedbin:
+    """A fake Feedbin API server holding its subscriptions and unread entries in memory."""
+
+    def __init__(self, config: FakeFeedbinConfig = FakeFeedbinConfig()) -> None:
+        self.config = config
+        self.subscriptions: dict[int, dict[str, Any]] = {}
+        self.unread_entry_ids: set[int] = set()
+        self._last_subscription_id = 0
+        self._entries: dict[tuple[int, int], list[dict[str, Any]]] = {}
+        self.entry_counts: dict[
+            int, int
+        ] = {}  # feed ID -> number of entries (default: entries_per_feed)
+        self.requests: Counter[str] = Counter()  # "METHOD /path" -> count (IDs replaced by :id)
+        self._lock = threading.Lock()
+        self._random = random.Random(config.seed)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def api(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/v2"
+
+    def start(self) -> Self:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def add_subscription(self, feed_url: str) -> dict[str, Any]:
+        with self._lock:
+            self._last_subscription_id += 1
+            subscription_id = self._last_subscription_id
+            subscription = {
+                "id": subscription_id,
+                "created_at": _created_at(subscription_id),
+                "feed_id": 1000 + subscription_id,
+                "title": f"Feed {subscription_id}",
+                "feed_url": feed_url,
+                "site_url": re.sub(r"/feed(\.xml)?$", "", feed_url),
+            }
+            self.subscriptions[subscription_id] = subscription
+            return subscription
+
+    def feed_entries(self, feed_id: int, since: str | None) -> list[dict[str, Any]]:
+        """Every entry in a feed (newest first), as Feedbin lists them."""
+        count = self.entry_counts.get(feed_id, self.config.entries_per_feed)
+
+        # Built once per feed, so serving each page of a big feed doesn't rebuild the whole list
+        if (entries := self._entries.get((feed_id, count))) is None:
+            first_id = feed_id * 1_000_000
+            entries = [
+                {"id": first_id + n, "feed_id": feed_id, "created_at": _created_at(n)}
+                for n in range(count, 0, -1)
+            ]
+            self._entries[(feed_id, count)] = entries
+
+        return entries if since is None else [e for e in entries if e["created_at"] > since]
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep connections alive, like the real API
+            disable_nagle_algorithm = True  # don't hold back bodies sent after their headers
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                self._handle()
+
+            def do_POST(self) -> None:
+                self._handle()
+
+            def do_PATCH(self) -> None:
+                self._handle()
+
+            def do_DELETE(self) -> None:
+                self._handle()
+
+            def _handle(self) -> None:
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+
+                with fake._lock:
+                    fake.requests[f"{self.command} {re.sub(r'/\d+', '/:id', url.path)}"] += 1
+                    throttled = fake._random.random() < fake.config.throttle_rate
+
+                if fake.config.latency:
+                    time.sleep(fake.config.latency)
+
+                if throttled:
+                    self._send(429, None, {"Retry-After": str(fake.config.retry_after)})
+                    return
+
+                self._route(url.path, parse_qs(url.query), body)
+
+            def _route(self, path: str, query: dict[str, list[str]], body: Any) -> None:
+                page = int(query.get("page", ["1"])[0])
+                since = query.get("since", [None])[0]
+
+                if match := re.fullmatch(r"/v2/feeds/(\d+)/entries\.json", path):
+                    entries = fake.feed_entries(int(match[1]), since)
+                    return self._send_page(path, query, entries, page)
+
+                if path == "/v2/subscriptions.json" and self.command == "GET":
+                    subscriptions = [
+                        s
+                        for s in fake.subscriptions.values()
+                        if since is None or s["created_at"] > since
+                    ]
+                    return self._send_page(path, query, subscriptions, page)
+
+                if path == "/v2/subscriptions.json" and self.command == "POST":
+                    return self._create_subscription(body["feed_url"])
+
+                if match := re.fullmatch(r"/v2/subscriptions/(\d+)\.json", path):
+                    return self._subscription(int(match[1]), body)
+
+                if path == "/v2/unread_entries.json" and self.command == "GET":
+                    return self._send(200, sorted(fake.unread_entry_ids))
+
+                if path == "/v2/unread_entries.json" and self.command == "POST":
+                    with fake._lock:
+                        fake.unread_entry_ids.update(body["unread_entries"])
+                    return self._send(200, body["unread_entries"])
+
+                self._send(404, {"status": 404, "message": "Not found"})
+
+            def _create_subscription(self, feed_url: str) -> None:
+                if "multiple" in feed_url:
+                    options = [
+                        {"feed_url": f"{feed_url.rstrip('/')}/{kind}.xml", "title": kind.title()}
+                        for kind in ("posts", "comments")
+                    ]
+                    return self._send(300, options)
+
+                for subscription in fake.subscriptions.values():
+                    if subscription["feed_url"] == feed_url:
+                        return self._send(302, subscription)
+
+                self._send(201, fake.add_subscription(feed_url))
+
+            def _subscription(self, subscription_id: int, body: Any) -> None:
+                subscription = fake.subscriptions.get(subscription_id)
+                if subscription is None:
+                    return self._send(404, {"status": 404, "message": "Not found"})
+
+                match self.command:
+                    case "GET":
+                        self._send(200, subscription)
+                    case "PATCH":
+                        subscription["title"] = body["title"]
+                        self._send(200, subscription)
+                    case "DELETE":
+                        with fake._lock:
+                            del fake.subscriptions[subscription_id]
+                        self._send(204, None)
+
+            def _send_page(
+                self,
+                path: str,
+                query: dict[str, list[str]],
+                items: list[dict[str, Any]],
+                page: int,
+            ) -> None:
+                size = fake.config.page_size
+                last = max(1, -(-len(items) // size))
+                headers = {}
+                if page < last:
+                    params = {k: v[0] for k, v in query.items() if k != "page"}
+
+                    def link(n: int) -> str:
+                        query_string = urlencode({**params, "page": n})
+                        return f"http://{self.headers['Host']}{path}?{query_string}"
+
+                    headers["links"] = f'<{link(page + 1)}>; rel="next", <{link(last)}>; rel="last"'
+
+                self._send(200, items[(page - 1) * size : page * size], headers)
+
+            def _send(self, status: int, body: Any, headers: dict[str, str] | None = None) -> None:
+                content = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if content:
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
@@ -0,0 +1,169 @@
+"""
+An in-memory stand-in for the gspread Worksheet used by rss/sheets.py, for offline benchmarks and tests.
+
+Implements the methods the scripts call (get_all_records, update and batch_update), counts every API call, cell and
+byte sent, and enforces Google's per-minute request quotas by raising the same APIError (429) gspread raises.
+
+Usage:
+ - sheet = FakeWorksheet.from_urls(urls)  # or .from_records(records)
+ - rows = parse_rows(sheet.get_all_records())
+ - with SheetWriteBuffer(cast(Worksheet, sheet)) as writes: ...
+ - sheet.stats.write_requests
+
+Docs:
+ - https://developers.google.com/sheets/api/limits
+ - https://docs.gspread.org/en/latest/api/models/worksheet.html
+"""
+
+import json
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Self
+
+import requests
+from gspread.exceptions import APIError
+from gspread.utils import a1_range_to_grid_range, numericise_all
+
+Seconds = float
+
+# Per-user quotas (the per-project ones are higher, and a single script is the only user)
+READ_REQUESTS_PER_MINUTE = 60
+WRITE_REQUESTS_PER_MINUTE = 60
+QUOTA_WINDOW: Seconds = 60.0
+
+# Columns A to I of the form responses sheet read by rss/sheets.py (which writes C to I)
+FORM_RESPONSE_HEADERS = [
+    "Timestamp",
+    "URL to subscribe to",
+    "Subscribed?",
+    "Marked unread?",
+    "Suffix added?",
+    "Status",
+    "Subscription ID",
+    "Feed ID",
+    "Details",
+]
+
+
+@dataclass
+class SheetStats:
+    read_requests: int = 0
+    write_requests: int = 0
+    throttled_requests: int = 0  # requests rejected with a 429 (not included in the counts above)
+    cells_written: int = 0
+    bytes_written: int = 0  # size of the JSON payloads sent by update and batch_update
+    calls: dict[str, int] = field(default_factory=dict)  # method name -> successful calls
+
+
+def _quota_error(kind: str, limit: int) -> APIError:
+    response = requests.Response()
+    response.status_code = 429
+    response._content = json.dumps(
+        {
+            "error": {
+                "code": 429,
+                "message": f"Quota exceeded for quota metric '{kind} requests' ({limit} per minute per user)",
+                "status": "RESOURCE_EXHAUSTED",
+            }
+        }
+    ).encode()
+    return APIError(response)
+
+
+def _cell_value(value: Any) -> str:
+    """Store values the way Sheets shows them (checkboxes come back as TRUE/FALSE)."""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return "" if value is None else str(value)
+
+
+class FakeWorksheet:
+    """A worksheet held in memory as a grid of formatted cell values (the first row holds the headers)."""
+
+    def __init__(
+        self,
+        values: list[list[str]],
+        *,
+        read_quota: int = READ_REQUESTS_PER_MINUTE,
+        write_quota: int = WRITE_REQUESTS_PER_MINUTE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.values = values
+        self.stats = SheetStats()
+        self._quotas = {"read": read_quota, "write": write_quota}
+        self._recent: dict[str, deque[float]] = {"read": deque(), "write": deque()}
+        self._clock = clock
+
+    @classmethod
+    def from_records(cls, records: list[dict[str, Any]], **kwargs: Any) -> Self:
+        """Build a sheet whose get_all_records() returns the given records (all with the same keys)."""
+        headers = list(records[0]) if records else []
+        rows = [[_cell_value(record.get(h)) for h in headers] for record in records]
+        return cls([headers, *rows], **kwargs)
+
+    @classmethod
+    def from_urls(cls, urls: list[str], **kwargs: Any) -> Self:
+        """Build a form responses sheet with one new (unprocessed) row per URL."""
+        rows = [
+            ["1/1/2025 12:00:00", url, "FALSE", "FALSE", "FALSE", "", "", "", ""] for url in urls
+        ]
+        return cls([FORM_RESPONSE_HEADERS, *rows], **kwargs)
+
+    def _request(self, kind: str, method: str) -> None:
+        """Count a request against its per-minute quota, raising a 429 APIError if the quota is used up."""
+        now = self._clock()
+        recent = self._recent[kind]
+        while recent and recent[0] <= now - QUOTA_WINDOW:
+            recent.popleft()
+
+        if len(recent) >= self._quotas[kind]:
+            self.stats.throttled_requests += 1
+            raise _quota_error(kind, self._quotas[kind])
+
+        recent.append(now)
+        self.stats.calls[method] = self.stats.calls.get(method, 0) + 1
+        if kind == "read":
+            self.stats.read_requests += 1
+        else:
+            self.stats.write_requests += 1
+
+    def get_all_records(self) -> list[dict[str, int | float | str]]:
+        self._request("read", "get_all_records")
+        headers, *rows = self.values or [[]]
+        records = []
+        for row in rows:
+            # Numbers come back as numbers and blank cells as "" (the gspread defaults)
+            values = numericise_all([*row, *[""] * (len(headers) - len(row))])
+            records.append({h: "" if v is None else v for h, v in zip(headers, values)})
+        return records
+
+    def _write(self, range_name: str, values: list[list[Any]]) -> None:
+        grid = a1_range_to_grid_range(range_name)
+        first_row, first_column = grid.get("startRowIndex", 0), grid.get("startColumnIndex", 0)
+
+        for r, row in enumerate(values):
+            row_index = first_row + r
+            while len(self.values) <= row_index:
+                self.values.append([])
+            cells = self.values[row_index]
+
+            for c, value in enumerate(row):
+                column_index = first_column + c
+                cells.extend([""] * (column_index + 1 - len(cells)))
+                cells[column_index] = _cell_value(value)
+                self.stats.cells_written += 1
+
+    def update(self, values: list[list[Any]], range_name: str) -> dict[str, Any]:
+        self._request("write", "update")
+        self.stats.bytes_written += len(json.dumps({"range": range_name, "values": values}))
+        self._write(range_name, values)
+        return {"updatedRange": range_name}
+
+    def batch_update(self, data: list[dict[str, Any]]) -> dict[str, Any]:
+        self._request("write", "batch_update")
+        self.stats.bytes_written += len(json.dumps({"data": data}))
+        for update in data:
+            self._write(update["range"], update["values"])
+        return {"totalUpdatedRanges": len(data)}
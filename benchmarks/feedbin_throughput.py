@@ -0,0 +1,205 @@
+"""
+Throughput and tail-latency benchmarks for the Feedbin layer, run offline against benchmarks/fake_feedbin.py.
+
+Each case runs at several sizes (entries, entry IDs or sheet rows) and reports the wall time, items and requests per
+second, and the p50/p95/p99 latency of the individual requests (from the request hooks in rss/utils/feedbin.py).
+The process_rows case reads and writes a fake sheet (benchmarks/fake_sheets.py) and also reports its Sheets API calls.
+
+Usage:
+ - PYTHONPATH=. uv run benchmarks/feedbin_throughput.py
+ - PYTHONPATH=. uv run benchmarks/feedbin_throughput.py --sizes 10,100 --latency 20 --throttle-rate 0.05
+ - PYTHONPATH=. uv run benchmarks/feedbin_throughput.py --json .logs/benchmark.json
+
+By default the shared rate limiter is opened up, so the benchmark measures the client instead of the limits it
+respects in production; pass --real-rate-limit to keep them.
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any, cast
+
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.fake_feedbin import FakeFeedbin, FakeFeedbinConfig
+from benchmarks.fake_sheets import FakeWorksheet
+
+DEFAULT_SIZES = (10, 100, 10_000)
+ENTRIES_PER_ROW = 20  # backlog size of each feed subscribed to by the process_rows case
+SHEETS_QUOTA = (
+    1_000_000  # count Sheets calls without throttling them (see benchmarks/fake_sheets.py)
+)
+
+
+@dataclass(frozen=True)
+class Result:
+    case: str
+    size: int
+    seconds: float
+    items_per_second: float
+    requests: int
+    requests_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    sheets_requests: int = 0  # Google Sheets API calls (only made by the process_rows case)
+
+
+def run_case(
+    case: str, size: int, fn: Callable[[], object], sheet: FakeWorksheet | None = None
+) -> Result:
+    """Time one call of fn, and summarize every Feedbin request it made (and any Sheets calls made to sheet)."""
+    from rss.utils.feedbin import request_hooks
+    from rss.utils.metrics import LatencyHistogram, RequestRecord
+
+    latency = LatencyHistogram()
+
+    def record(request: RequestRecord) -> None:
+        latency.record(request.duration)
+
+    request_hooks.append(record)
+    started_at = time.perf_counter()
+    try:
+        fn()
+    finally:
+        seconds = time.perf_counter() - started_at
+        request_hooks.remove(record)
+
+    return Result(
+        case=case,
+        size=size,
+        seconds=round(seconds, 3),
+        items_per_second=round(size / seconds, 1),
+        requests=latency.count,
+        requests_per_second=round(latency.count / seconds, 1),
+        p50_ms=latency.percentile(50) / 1000,
+        p95_ms=latency.percentile(95) / 1000,
+        p99_ms=latency.percentile(99) / 1000,
+        sheets_requests=sheet.stats.read_requests + sheet.stats.write_requests if sheet else 0,
+    )
+
+
+def run_benchmarks(feedbin: FakeFeedbin, sizes: list[int]) -> list[Result]:
+    # Imported here so they pick up the FEEDBIN_API set by main
+    from rss.entries.mark_unread.feedbin import create_unread_entries
+    from rss.sheets import load_run_context, parse_rows, process_rows
+    from rss.utils.feedbin import API, RequestArgs, make_paginated_request
+    from rss.utils.sheets import SheetWriteBuffer
+
+    results = []
+
+    for size in sizes:
+        feed_id = 10_000 + size
+        feedbin.entry_counts[feed_id] = size
+        args = RequestArgs(url=f"{API}/feeds/{feed_id}/entries.json")
+        results.append(
+            run_case("make_paginated_request", size, lambda: make_paginated_request(args))
+        )
+
+    for size in sizes:
+        entry_ids = list(range(1, size + 1))
+        results.append(
+            run_case("create_unread_entries", size, lambda: create_unread_entries(entry_ids))
+        )
+
+    for size in sizes:
+        sheet = FakeWorksheet.from_urls(
+            [f"https://example-{size}-{i}.com/feed" for i in range(size)],
+            read_quota=SHEETS_QUOTA,
+            write_quota=SHEETS_QUOTA,
+        )
+
+        def process() -> None:
+            rows = parse_rows(sheet.get_all_records())
+            with SheetWriteBuffer(cast(Any, sheet)) as writes:
+                process_rows(rows, writes, load_run_context())
+
+        results.append(run_case("process_rows", size, process, sheet))
+
+    return results
+
+
+def results_table(results: list[Result]) -> Table:
+    table = Table(
+        title="Feedbin throughput (latency in ms):",
+        show_header=True,
+        title_justify="left",
+        title_style="bold cyan",
+    )
+    table.add_column(header="Case", style="yellow", no_wrap=True)
+    table.add_column(header="Size", style="magenta", justify="right")
+    table.add_column(header="Seconds", style="white", justify="right")
+    table.add_column(header="Items/s", style="cyan", justify="right")
+    table.add_column(header="Reqs", style="magenta", justify="right")
+    table.add_column(header="Reqs/s", style="cyan", justify="right")
+    table.add_column(header="p50", style="green", justify="right")
+    table.add_column(header="p95", style="yellow", justify="right")
+    table.add_column(header="p99", style="red", justify="right")
+    table.add_column(header="Sheets", style="magenta", justify="right")
+
+    for r in results:
+        table.add_row(
+            r.case,
+            str(r.size),
+            f"{r.seconds:.2f}",
+            f"{r.items_per_second:.0f}",
+            str(r.requests),
+            f"{r.requests_per_second:.0f}",
+            f"{r.p50_ms:.1f}",
+            f"{r.p95_ms:.1f}",
+            f"{r.p99_ms:.1f}",
+            str(r.sheets_requests) if r.case == "process_rows" else "",
+        )
+
+    return table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--latency", type=float, default=0.0, help="ms added to every response")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests to 429")
+    parser.add_argument("--real-rate-limit", action="store_true")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    config = FakeFeedbinConfig(
+        latency=args.latency / 1000,
+        page_size=args.page_size,
+        entries_per_feed=ENTRIES_PER_ROW,
+        throttle_rate=args.throttle_rate,
+    )
+
+    with FakeFeedbin(config) as feedbin:
+        os.environ["FEEDBIN_API"] = feedbin.api
+        os.environ["NO_CACHE"] = "true"  # measure requests, not .local_cache/
+
+        import rss.utils.feedbin as feedbin_utils
+        from rss.utils.rate_limit import AdaptiveRateLimiter
+
+        feedbin_utils._auth = ("benchmark", "benchmark")  # skip 1Password
+        if not args.real_rate_limit:
+            feedbin_utils.rate_limiter = AdaptiveRateLimiter(
+                rate=10_000, max_rate=10_000, burst=1_000
+            )
+        logging.getLogger("scripts").setLevel(logging.WARNING)
+
+        results = run_benchmarks(feedbin, [int(size) for size in args.sizes.split(",")])
+
+    Console().print(results_table(results))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Check that CLI startup stays within its import-time budget.
+
+Runs each command below with `python -X importtime`, adds up the cumulative import time of every top-level import,
+and fails if a command goes over its budget or imports a module it should only load when a subcommand actually runs
+(see the lazy subcommands in cli.py).
+
+Usage:
+ - PYTHONPATH=. uv run benchmarks/import_time.py
+ - PYTHONPATH=. uv run benchmarks/import_time.py --verbose  # also list each command's slowest imports
+
+Docs:
+ - https://docs.python.org/3/using/cmdline.html#cmdoption-X
+"""
+
+import subprocess
+import sys
+from dataclasses import dataclass
+
+Milliseconds = float
+
+
+@dataclass(frozen=True)
+class Budget:
+    args: tuple[str, ...]
+    max_import_time: Milliseconds
+    forbidden_modules: tuple[str, ...] = ()
+
+
+# Generous enough to absorb noise between runs, tight enough to catch an eager import of a heavy dependency
+BUDGETS = [
+    Budget(
+        args=("cli.py", "--help"),
+        max_import_time=400,
+        forbidden_modules=("rss", "modem", "pydantic", "requests", "gspread", "playwright"),
+    ),
+    Budget(
+        args=("cli.py", "feedbin", "--help"),
+        max_import_time=600,
+        forbidden_modules=("modem", "requests", "gspread", "playwright"),
+    ),
+    Budget(
+        args=("cli.py", "modem", "--help"),
+        max_import_time=500,
+        forbidden_modules=("rss", "pydantic", "requests", "gspread", "playwright"),
+    ),
+]
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    cumulative: Milliseconds
+    depth: int  # 0 for modules imported directly by the command
+
+
+def measure_imports(args: tuple[str, ...]) -> list[ImportTime]:
+    """Run a command with -X importtime and parse the timings it writes to stderr."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+    )
+
+    imports = []
+    for line in result.stderr.splitlines():
+        # e.g. "import time:       777 |     179202 |   typer.main"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append(ImportTime(module, int(cumulative) / 1000, depth))
+
+    return imports
+
+
+def check_budget(budget: Budget, *, verbose: bool = False) -> list[str]:
+    """Return a description of every way the command goes over its budget."""
+    imports = measure_imports(budget.args)
+    total = sum(i.cumulative for i in imports if i.depth == 0)
+    command = " ".join(budget.args)
+
+    print(f"⏱️  {command}: {total:.0f} ms (budget: {budget.max_import_time:.0f} ms)")
+
+    if verbose:
+        for i in sorted(imports, key=lambda i: i.cumulative, reverse=True)[:10]:
+            print(f"     {i.cumulative:8.1f} ms  {'  ' * i.depth}{i.module}")
+
+    failures = []
+
+    if total > budget.max_import_time:
+        failures.append(
+            f"{command} took {total:.0f} ms to import (budget: {budget.max_import_time:.0f} ms)"
+        )
+
+    for forbidden in budget.forbidden_modules:
+        if any(i.module == forbidden or i.module.startswith(f"{forbidden}.") for i in imports):
+            failures.append(f"{command} imported {forbidden}")
+
+    return failures
+
+
+def main(*, verbose: bool = False) -> None:
+    failures = [failure for budget in BUDGETS for failure in check_budget(budget, verbose=verbose)]
+
+    if failures:
+        for failure in failures:
+            print(f"🚨 {failure}")
+        sys.exit(1)
+
+    print("✅ All commands are within their import-time budgets")
+
+
+if __name__ == "__main__":
+    main(verbose="--verbose" in sys.argv)
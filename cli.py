@@ -1,6 +1,9 @@
 """
 CLI for running scripts.
 
+Each subcommand's module (and its heavy dependencies, like Playwright or gspread) is only imported when that
+subcommand runs, so `--help` stays fast. Run benchmarks/import_time.py to check startup stays within budget.
+
 Usage:
  - uv run cli.py feedbin
  - uv run cli.py feedbin add
@@ -12,14 +15,20 @@ Docs:
  - https://typer.tiangolo.com/tutorial/subcommands/nested-subcommands/#review-the-files
 """
 
-import typer
+from common.typer import lazy_typer
+
+app = lazy_typer(
+    {
+        "feedbin": ("rss.cli:app", "Manage Feedbin RSS feed subscriptions and entries."),
+        "modem": ("modem.restart:app", "Restart the modem."),
+    },
+    no_args_is_help=True,
+)
 
-import feedbin.adapters.cli as feedbin_cli
-import modem.restart as modem_cli
 
-app = typer.Typer(no_args_is_help=True)
-app.add_typer(feedbin_cli.app, name="feedbin")
-app.add_typer(modem_cli.app, name="modem")
+@app.callback()
+def main() -> None:
+    """Scripts for automating my personal chores."""
 
 
 if __name__ == "__main__":
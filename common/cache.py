@@ -0,0 +1,144 @@
+"""
+A small on-disk cache for JSON-serializable values, stored under .local_cache/ so it survives between runs.
+
+Each entry is one JSON file (named after a hash of its key) holding its key, value and expiry time. Reading an
+entry refreshes its modification time, which is what the least-recently-used eviction goes by once the cache
+grows past its size cap.
+
+Set NO_CACHE=true to bypass every cache (reads miss and writes are skipped).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from common.logs import log
+
+CACHE_DIR = ".local_cache"
+MAX_CACHE_SIZE = 50 * 1024 * 1024  # 50 MB in bytes
+
+CacheKey = str
+Seconds = float
+
+
+def _cache_disabled() -> bool:
+    return os.getenv("NO_CACHE") == "true"
+
+
+class DiskCache:
+    """A namespaced, size-capped JSON cache with per-entry TTLs and LRU eviction."""
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        max_size: int = MAX_CACHE_SIZE,
+        cache_dir: str = CACHE_DIR,
+    ) -> None:
+        self._dir = Path(cache_dir) / namespace
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        # Running total, so the directory is only scanned once the cache might be full
+        self._approximate_size: int | None = None
+
+    def _path(self, key: CacheKey) -> Path:
+        return self._dir / f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.json"
+
+    def _remove(self, path: Path) -> None:
+        """Delete an entry's file and take its size off the running total."""
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+
+        with self._lock:
+            if self._approximate_size is not None:
+                self._approximate_size -= size
+
+    def get(self, key: CacheKey) -> Any | None:
+        """Return the cached value for the key, or None if it's missing or expired."""
+        if _cache_disabled():
+            return None
+
+        path = self._path(key)
+
+        try:
+            entry = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        expires_at = entry.get("expires_at")
+        if entry.get("key") != key or (expires_at is not None and expires_at < time.time()):
+            self._remove(path)
+            return None
+
+        path.touch()  # mark as recently used
+        log.debug(f"💾 Cache hit: {key}")
+        return entry["value"]
+
+    def set(self, key: CacheKey, value: Any, ttl: Seconds | None = None) -> None:
+        """Cache a JSON-serializable value for ttl seconds (or until evicted, if no ttl is given)."""
+        if _cache_disabled():
+            return
+
+        entry = {
+            "key": key,
+            "expires_at": time.time() + ttl if ttl is not None else None,
+            "value": value,
+        }
+
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a half-written entry
+        with tempfile.NamedTemporaryFile("w", dir=self._dir, suffix=".tmp", delete=False) as f:
+            json.dump(entry, f, separators=(",", ":"))
+        path = self._path(key)
+        try:
+            replaced_size = path.stat().st_size
+        except FileNotFoundError:
+            replaced_size = 0
+        os.replace(f.name, path)
+
+        with self._lock:
+            if self._approximate_size is not None:
+                self._approximate_size += path.stat().st_size - replaced_size
+
+        if self._approximate_size is None or self._approximate_size > self._max_size:
+            self._evict()
+
+    def invalidate(self, *keys: CacheKey) -> None:
+        """Remove the entries for the given keys (e.g. after the resource they describe changed)."""
+        for key in keys:
+            self._remove(self._path(key))
+
+    def clear(self) -> None:
+        """Remove every entry in this cache's namespace."""
+        for path in self._dir.glob("*.json"):
+            self._remove(path)
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries until the namespace fits within its size cap."""
+        with self._lock:
+            entries = []
+            for path in self._dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total_size = sum(size for _, size, _ in entries)
+
+            for _, size, path in sorted(entries):
+                if total_size <= self._max_size:
+                    break
+                path.unlink(missing_ok=True)
+                total_size -= size
+
+            self._approximate_size = total_size
@@ -0,0 +1,61 @@
+"""
+An append-only JSON lines journal, stored under .local_cache/ so a run that dies partway can pick up where it left
+off.
+
+Each record is written as one line and flushed right away, so everything recorded before a crash is kept. A line
+cut short by the crash is skipped when the journal is read back. Clear the journal once the work it tracks is done.
+
+Docs:
+ - https://jsonlines.org
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from common.cache import CACHE_DIR
+from common.logs import log
+
+JournalRecord = dict[str, Any]
+
+
+class Journal:
+    """A named, thread-safe, append-only log of JSON-serializable records."""
+
+    def __init__(self, name: str, *, cache_dir: str = CACHE_DIR) -> None:
+        self.path = Path(cache_dir) / f"{name}.jsonl"
+        self._lock = threading.Lock()
+
+    def append(self, record: JournalRecord) -> None:
+        """Add a record to the end of the journal (flushed to disk before returning)."""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(f"{line}\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def records(self) -> list[JournalRecord]:
+        """Return every complete record in the order it was written (or none if there is no journal)."""
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                log.warning(f"⚠️ Skipping an incomplete record in {self.path}")
+
+        return records
+
+    def clear(self) -> None:
+        """Delete the journal (e.g. once the run it tracks has finished)."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
@@ -1,8 +1,13 @@
+import atexit
+import json
 import logging
+import os
+import queue
+from datetime import UTC, datetime
 from functools import partial
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal, TypedDict, Unpack
 
 from rich.logging import RichHandler
 
@@ -15,6 +20,63 @@ from rich.logging import RichHandler
 LOG_DIR = ".logs"
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB in bytes
 BACKUP_COUNT = 5
+LOG_QUEUE_SIZE = 10_000  # records waiting to be handled before the queue policy kicks in
+
+# What to do with a record logged while the queue is full (set LOG_QUEUE_POLICY=drop to prefer speed):
+# - "block": wait for the listener to catch up, so nothing is lost
+# - "drop": discard DEBUG and INFO records (warnings and errors still wait), so logging never slows the caller
+QueuePolicy = Literal["block", "drop"]
+DEFAULT_QUEUE_POLICY: QueuePolicy = "block"
+
+
+def _json_logs() -> bool:
+    """Set LOG_FORMAT=json to write one JSON object per line to the log files (for analysis with jq, pandas, etc)."""
+    return os.getenv("LOG_FORMAT") == "json"
+
+
+class LogFields(TypedDict, total=False):
+    """Typed fields attached to a record with log_fields, written as top-level keys in JSON log lines."""
+
+    row_index: int
+    status: str
+    endpoint: str
+    method: str
+    status_code: int
+    duration_ms: float
+    attempts: int
+
+
+def log_fields(**fields: Unpack[LogFields]) -> dict[str, LogFields]:
+    """
+    Build the `extra` argument that attaches typed fields to a log record.
+
+    Example:
+     - log.debug("🔍 updated_row: %s", row, extra=log_fields(row_index=row.index, status=row.status))
+    """
+    return {"fields": fields}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format each record as a compact, single-line JSON object (including any fields from log_fields)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "file": record.filename,
+            "line": record.lineno,
+            "function": record.funcName,
+        }
+
+        entry.update(getattr(record, "fields", {}))
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
 
 
 def file_handler(level: Literal["debug", "error"]) -> logging.FileHandler:
@@ -31,7 +93,9 @@ def file_handler(level: Literal["debug", "error"]) -> logging.FileHandler:
     )
     file_handler.setLevel(level.upper())
     file_handler.setFormatter(
-        logging.Formatter(
+        JsonLinesFormatter()
+        if _json_logs()
+        else logging.Formatter(
             "%(asctime)s %(levelname)-8s %(message)s (%(filename)s:%(lineno)d:%(funcName)s)",
             datefmt="%Y-%m-%d %H:%M:%S",
         )
@@ -40,24 +104,91 @@ def file_handler(level: Literal["debug", "error"]) -> logging.FileHandler:
     return file_handler
 
 
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hand records to a QueueListener without formatting them on the caller's thread.
+
+    The default QueueHandler.prepare formats each record before enqueueing it (so it can cross process
+    boundaries). The listener here runs in a thread of the same process, so records are enqueued as is and all
+    formatting, rotation and disk I/O happens on the listener's thread instead.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]", policy: QueuePolicy) -> None:
+        super().__init__(log_queue)
+        self.log_queue = log_queue
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.policy == "drop" and record.levelno < logging.WARNING:
+            try:
+                self.log_queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+            return
+
+        self.log_queue.put(record)
+
+
+class BoundedQueueListener(QueueListener):
+    """A QueueListener that waits for room in a full queue when asked to stop (instead of raising queue.Full)."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+
+def _queue_policy() -> QueuePolicy:
+    return "drop" if os.getenv("LOG_QUEUE_POLICY") == "drop" else DEFAULT_QUEUE_POLICY
+
+
 _log = None
+_listener: BoundedQueueListener | None = None
+_queue_handler: BoundedQueueHandler | None = None
+
+
+def stop_logging() -> None:
+    """Handle every record still in the queue and stop the listener thread (runs automatically at exit)."""
+    global _listener
+
+    if _listener is None:
+        return
+
+    if _queue_handler is not None and _queue_handler.dropped:
+        logging.getLogger("scripts").warning(
+            f"⚠️ Dropped {_queue_handler.dropped} log records while the log queue was full"
+        )
+
+    _listener.stop()
+    _listener = None
 
 
 def get_logger() -> logging.Logger:
     """Create and cache the logger."""
-    global _log
+    global _log, _listener, _queue_handler
 
     if _log is None:
-        # Configure console + file handlers
+        # Configure console + file handlers, which run on a background thread fed by a queue
+        console_handler = RichHandler(rich_tracebacks=True, tracebacks_show_locals=True)
+        console_handler.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _queue_handler = BoundedQueueHandler(log_queue, _queue_policy())
+        _listener = BoundedQueueListener(
+            log_queue,
+            console_handler,
+            file_handler(level="debug"),
+            file_handler(level="error"),
+            respect_handler_level=True,
+        )
+        _listener.start()
+        atexit.register(stop_logging)
+
         logging.basicConfig(
             level=logging.WARNING,  # set third-party loggers to WARNING
-            format="%(message)s",
-            datefmt="[%X]",
-            handlers=[
-                RichHandler(rich_tracebacks=True, tracebacks_show_locals=True),
-                file_handler(level="debug"),
-                file_handler(level="error"),
-            ],
+            handlers=[_queue_handler],
         )
 
         # Always output exceptions and stack traces when logging an error
@@ -74,4 +205,4 @@ def get_logger() -> logging.Logger:
 log = get_logger()
 
 # Export the logger
-__all__ = ["log"]
+__all__ = ["log", "log_fields"]
@@ -5,24 +5,30 @@ Docs:
 """
 
 import os
-
-from pushover_complete import PushoverAPI  # type: ignore[import-untyped]
+from typing import TYPE_CHECKING
 
 from common.logs import log
 from common.secrets import get_secret
 
+if TYPE_CHECKING:
+    from pushover_complete import PushoverAPI  # type: ignore[import-untyped]
+
 OP_ITEM = "Pushover"
 OP_FIELD_APP_TOKEN = "app: scripts repo"
 OP_FIELD_USER_KEY = "user key"
+SECRETS = ((OP_ITEM, OP_FIELD_APP_TOKEN), (OP_ITEM, OP_FIELD_USER_KEY))
 
-_client: PushoverAPI | None = None
+_client: "PushoverAPI | None" = None
 
 
-def get_client() -> PushoverAPI:
+def get_client() -> "PushoverAPI":
     """Return a reusable pushover client."""
     global _client
 
     if _client is None:
+        # Imported here so entry points that never send a notification don't pay for requests
+        from pushover_complete import PushoverAPI
+
         _client = PushoverAPI(get_secret(OP_ITEM, OP_FIELD_APP_TOKEN))
 
     return _client
@@ -8,10 +8,15 @@ the 1Password CLI to authenticate the service account user used in that environm
 
 Docs:
  - https://developer.1password.com/docs/cli/secret-reference-syntax/
+ - https://developer.1password.com/docs/cli/secrets-template-syntax/
  - https://docs.github.com/en/actions/security-for-github-actions/security-guides/using-secrets-in-github-actions#creating-secrets-for-a-repository
 """
 
 import subprocess
+import threading
+import time
+import uuid
+from collections.abc import Iterable
 
 # Docs (service accounts):
 # - https://developer.1password.com/docs/service-accounts/get-started/
@@ -23,6 +28,7 @@ import subprocess
 # - https://developer.1password.com/docs/cli/reference/
 
 VAULT = "Scripts"
+SECRET_TTL = 15 * 60  # 15 minutes in seconds
 
 
 def build_secret_reference(item: str, field: str) -> str:
@@ -35,18 +41,115 @@ def build_secret_reference(item: str, field: str) -> str:
 
 
 PasswordOrStringifiedJson = str
+SecretReference = str
 
+# The (item, field) pairs an entry point needs, so they can all be resolved up front with load_secrets
+SecretManifest = Iterable[tuple[str, str]]
 
-def get_secret(item: str, field: str) -> PasswordOrStringifiedJson:
+# Secrets already read during this process, with when they expire (kept in memory only, never written to disk)
+_secrets: dict[SecretReference, tuple[PasswordOrStringifiedJson, float]] = {}
+_secrets_lock = threading.Lock()
+
+
+def get_secret(item: str, field: str, *, ttl: float = SECRET_TTL) -> PasswordOrStringifiedJson:
     """
     Generate a 1Password secret reference and retrieve the secret's value.
+
+    Each value is kept in memory for ttl seconds, so repeated lookups don't spawn another `op` process (and trigger
+    another authentication prompt).
     """
     secret_reference = build_secret_reference(item, field)
 
+    # Holding the lock while reading means concurrent lookups of the same secret only run `op` once
+    with _secrets_lock:
+        cached = _secrets.get(secret_reference)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        result = subprocess.run(
+            ["op", "read", secret_reference],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        secret = result.stdout.strip()
+        _secrets[secret_reference] = (secret, time.monotonic() + ttl)
+
+    return secret
+
+
+def invalidate_secret(item: str, field: str) -> None:
+    """Forget a cached secret (e.g. after it was rejected), so the next lookup reads it from 1Password again."""
+    with _secrets_lock:
+        _secrets.pop(build_secret_reference(item, field), None)
+
+
+def clear_secrets() -> None:
+    """Forget every cached secret."""
+    with _secrets_lock:
+        _secrets.clear()
+
+
+def _inject(references: list[SecretReference]) -> list[PasswordOrStringifiedJson]:
+    """
+    Resolve several secret references with a single `op inject` call.
+
+    Each reference goes into a template between marker lines with a random token, so the values (which may span
+    several lines, like a JSON key) can be split back apart unambiguously.
+    """
+    token = uuid.uuid4().hex
+    markers = [f"<<{token}:{i}>>" for i in range(len(references) + 1)]
+    template = "".join(
+        f"{marker}\n{{{{ {reference} }}}}\n" for marker, reference in zip(markers, references)
+    )
+    template += f"{markers[-1]}\n"
+
     result = subprocess.run(
-        ["op", "read", secret_reference],
+        ["op", "inject"],
+        input=template,
         capture_output=True,
         text=True,
         check=True,
     )
-    return result.stdout.strip()
+
+    output = result.stdout
+    values = []
+    for start, end in zip(markers, markers[1:]):
+        value_start = output.index(f"{start}\n") + len(start) + 1
+        values.append(output[value_start : output.index(end, value_start)].strip())
+
+    return values
+
+
+def load_secrets(manifest: SecretManifest, *, ttl: float = SECRET_TTL) -> None:
+    """
+    Resolve every secret in the manifest that isn't cached yet with one `op` call, and cache them for get_secret.
+
+    Falls back to reading each secret on its own if `op inject` fails, so one bad reference is reported the same
+    way it would be without the manifest.
+
+    Example:
+     - load_secrets([("Feedbin", "username"), ("Feedbin", "password")])
+    """
+    with _secrets_lock:
+        now = time.monotonic()
+        references = list(
+            dict.fromkeys(
+                reference
+                for reference in (build_secret_reference(item, field) for item, field in manifest)
+                if reference not in _secrets or _secrets[reference][1] <= now
+            )
+        )
+
+        if not references:
+            return
+
+        try:
+            values = _inject(references)
+        except (subprocess.CalledProcessError, ValueError):
+            return
+
+        expires_at = time.monotonic() + ttl
+        _secrets.update(
+            {reference: (value, expires_at) for reference, value in zip(references, values)}
+        )
@@ -0,0 +1,71 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from common.cache import DiskCache
+
+
+@pytest.fixture(autouse=True)
+def enable_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("NO_CACHE", raising=False)
+
+
+def make_cache(tmp_path: Path, max_size: int = 1024 * 1024) -> DiskCache:
+    return DiskCache("test", max_size=max_size, cache_dir=str(tmp_path))
+
+
+def size_on_disk(tmp_path: Path) -> int:
+    return sum(path.stat().st_size for path in (tmp_path / "test").glob("*.json"))
+
+
+class TestTtl:
+    def test_entries_expire_after_their_ttl(
+        _, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cache = make_cache(tmp_path)
+        cache.set("key", "value", ttl=60)
+
+        assert cache.get("key") == "value"
+
+        later = time.time() + 61
+        monkeypatch.setattr(time, "time", lambda: later)
+
+        assert cache.get("key") is None
+        assert size_on_disk(tmp_path) == 0
+
+    def test_entries_without_a_ttl_never_expire(_, tmp_path: Path) -> None:
+        cache = make_cache(tmp_path)
+        cache.set("key", "value")
+
+        assert cache.get("key") == "value"
+
+
+class TestSizeCap:
+    def test_evicts_the_least_recently_used_entries_first(_, tmp_path: Path) -> None:
+        cache = make_cache(tmp_path)
+        cache.set("a", "x" * 100)
+        entry_size = size_on_disk(tmp_path)
+        cache = make_cache(tmp_path, max_size=int(entry_size * 2.5))  # room for two entries
+
+        cache.set("b", "y" * 100)
+        os.utime(cache._path("a"), (1_000, 1_000))
+        os.utime(cache._path("b"), (2_000, 2_000))
+        cache.get("a")  # now the most recently used
+
+        cache.set("c", "z" * 100)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_running_size_tracks_overwrites_and_invalidations(_, tmp_path: Path) -> None:
+        cache = make_cache(tmp_path)
+
+        for i in range(10):
+            cache.set("a", "x" * (i * 10))
+        cache.set("b", "y")
+        cache.invalidate("b")
+
+        assert cache._approximate_size == size_on_disk(tmp_path)
@@ -1,12 +1,69 @@
+import importlib
 import os
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
+import click
 import typer
 from rich.table import Table
+from typer.core import TyperGroup
 
 DryRun = Annotated[bool, typer.Option("--dry-run", "-d", help="Dry run mode")]
 
+ImportPath = str  # e.g. "modem.restart:app"
+HelpText = str
+LazySubcommands = dict[str, tuple[ImportPath, HelpText]]
+
+_LISTING_COMMANDS = "lazy_typer.listing_commands"
+
+
+class LazyTyperGroup(TyperGroup):
+    """
+    A command group whose sub-apps are only imported when one of them is actually run.
+
+    Listing the subcommands (e.g. for --help) uses the help text registered alongside each import path, so it never
+    imports a sub-app or any of its dependencies.
+
+    Docs:
+     - https://click.palletsprojects.com/en/8.1.x/complex/#lazily-loading-subcommands
+    """
+
+    lazy_subcommands: LazySubcommands = {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return [*super().list_commands(ctx), *self.lazy_subcommands]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+
+        import_path, help_text = self.lazy_subcommands[cmd_name]
+
+        if ctx.meta.get(_LISTING_COMMANDS):
+            return click.Command(cmd_name, help=help_text, short_help=help_text)
+
+        module_name, attribute = import_path.split(":")
+        sub_app = getattr(importlib.import_module(module_name), attribute)
+        return typer.main.get_group(sub_app)
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        ctx.meta[_LISTING_COMMANDS] = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            ctx.meta[_LISTING_COMMANDS] = False
+
+
+def lazy_typer(subcommands: LazySubcommands, **kwargs: Any) -> typer.Typer:
+    """
+    Create a Typer app whose subcommands are imported on demand.
+
+    Example:
+     - app = lazy_typer({"modem": ("modem.restart:app", "Manage the modem.")}, no_args_is_help=True)
+    """
+    group_class = type("LazyGroup", (LazyTyperGroup,), {"lazy_subcommands": subcommands})
+    return typer.Typer(cls=group_class, **kwargs)
+
 
 # TODO: delete? not currently used... maybe useful for feed choices?
 def get_env(dry_run: str = "false") -> dict[str, str]:
@@ -1,17 +1,22 @@
 import os
 
 import typer
-from playwright.sync_api import sync_playwright
 
 from common.logs import log
+from common.pushover import SECRETS as PUSHOVER_SECRETS
 from common.pushover import send_notification
-from common.secrets import get_secret
+from common.secrets import get_secret, load_secrets
 from common.typer import DryRun
 
 app = typer.Typer(no_args_is_help=True)
 
+SECRETS = (("Modem", "website"), ("Modem", "password"), *PUSHOVER_SECRETS)
+
 
 def _log_in_and_restart(url: str, password: str, *, dry_run: bool) -> None:
+    # Imported here so Playwright (which is slow to import) only loads when the modem is actually restarted
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
@@ -51,6 +56,7 @@ def _log_in_and_restart(url: str, password: str, *, dry_run: bool) -> None:
 
 @app.command("restart")
 def restart(dry_run: DryRun = False) -> None:
+    load_secrets(SECRETS)
     modem_url = get_secret("Modem", "website")
     modem_password = get_secret("Modem", "password")
     dry_run = os.getenv("DRY_RUN") == "true" or dry_run
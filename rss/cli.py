@@ -1,11 +1,13 @@
 """
 CLI adapter for Feedbin. All usage of typer should occur in this module.
+
+Each command imports the adapters it calls inside its own body, so loading this module (e.g. for --help) only costs
+typer and the domain types used in the command signatures.
 """
 
 import os
 from typing import Annotated
 
-import rich
 import typer
 
 from common.logs import log
@@ -25,8 +27,13 @@ MarkUnread = Annotated[bool, typer.Option("--unread", "-u", help="Mark backlog u
 
 def list_subscriptions() -> None:
     """List all Feedbin RSS feed subscriptions."""
+    from rss.subscriptions.list.feedbin import get_subscriptions
+
     log.info("📋 Listing subscriptions")
 
+    result, _ = get_subscriptions()
+    log.info(result.value)
+
 
 def mark_entries_unread(entry_ids: list[EntryId]) -> None:
     """Mark one or more feed entries as unread by their entry IDs."""
@@ -38,9 +45,9 @@ def mark_entries_unread(entry_ids: list[EntryId]) -> None:
 
 def get_feed_entries(feed_id: FeedId) -> None:
     """List all entries for an RSS feed subscription by its feed ID."""
-    from rss.entries.list.feedbin import get_feed_entries as _get_feed_entries
+    from rss.entries.list.feedbin import sync_feed_entries
 
-    result, data = _get_feed_entries(feed_id)
+    result, data = sync_feed_entries(feed_id)
     log.info(result.value)
 
 
@@ -62,6 +69,8 @@ def _ask_for_feed_choice(feeds: list[FeedOption]) -> FeedOption:
 
 @app.command("add", no_args_is_help=True)
 def add(url: str, mark_backlog_unread: MarkUnread = False, dry_run: DryRun = False) -> None:
+    import rich
+
     dry_run = os.getenv("DRY_RUN") == "true" or dry_run
 
     typer.confirm(f"🔖 Subscribe to '{url}'?", default=True, abort=True)
@@ -1,12 +1,28 @@
 """Feedbin API interactions for listing all entries in an RSS feed subscription."""
 
+from collections.abc import Iterator
 from enum import Enum
+from itertools import chain
 from typing import Literal
 
 from requests import HTTPError
 
+from common.cache import DiskCache
 from rss.domain import Entry, FeedId
-from rss.utils.feedbin import API, RequestArgs, make_paginated_request
+from rss.utils.feedbin import (
+    API,
+    Page,
+    RequestArgs,
+    cache_key,
+    iter_paginated_request,
+    response_cache,
+)
+
+CACHE_TTL = 15 * 60  # 15 minutes in seconds
+
+# Per-feed index of every entry ID seen so far and the high-water mark used by stream_sync_feed_entries
+entry_index = DiskCache("feedbin-entry-index")
+ENTRY_INDEX_REBUILD_INTERVAL = 30 * 24 * 60 * 60  # 30 days in seconds
 
 
 class GetFeedEntriesResult(str, Enum):
@@ -27,6 +43,15 @@ GetFeedEntriesOutput = (
     | tuple[Literal[GetFeedEntriesResult.UNEXPECTED_ERROR], str]
 )
 
+StreamFeedEntriesOutput = (
+    tuple[Literal[GetFeedEntriesResult.OK], Iterator[Entry]]
+    | tuple[Literal[GetFeedEntriesResult.FORBIDDEN], FeedId]
+    | tuple[Literal[GetFeedEntriesResult.NOT_FOUND], FeedId]
+    | tuple[Literal[GetFeedEntriesResult.UNEXPECTED_STATUS_CODE], int]
+    | tuple[Literal[GetFeedEntriesResult.HTTP_ERROR], str]
+    | tuple[Literal[GetFeedEntriesResult.UNEXPECTED_ERROR], str]
+)
+
 
 def get_feed_entries(
     feed_id: FeedId,
@@ -35,7 +60,10 @@ def get_feed_entries(
     starred: bool | None = None,
 ) -> GetFeedEntriesOutput:
     """
-    Get all entries for a feed.
+    Get all entries for a feed (served from the local cache for up to CACHE_TTL).
+
+    Results filtered by read or starred status are never cached, since marking entries read, unread or starred
+    (e.g. with create_unread_entries) changes them without going through this cache.
 
     Params:
     - read: Filter by read status. Options: True, False, None.
@@ -52,9 +80,16 @@ def get_feed_entries(
         params={"read": read, "starred": starred},
     )
 
+    cacheable = read is None and starred is None
+
+    if cacheable and (cached := response_cache.get(cache_key(request_args))) is not None:
+        return GetFeedEntriesResult.OK, [Entry(id=id) for id in cached]
+
     try:
-        all_entries = make_paginated_request(request_args)
-        entries = [Entry(id=entry["id"]) for entry in all_entries]
+        pages = iter_paginated_request(request_args)
+        entries = [Entry(id=entry["id"]) for page in pages for entry in page]
+        if cacheable:
+            response_cache.set(cache_key(request_args), [entry.id for entry in entries], CACHE_TTL)
         return GetFeedEntriesResult.OK, entries
     except HTTPError as e:
         match e.response.status_code:
@@ -65,3 +100,79 @@ def get_feed_entries(
         return GetFeedEntriesResult.HTTP_ERROR, str(e)
     except Exception as e:
         return GetFeedEntriesResult.UNEXPECTED_ERROR, str(e)
+
+
+def stream_sync_feed_entries(feed_id: FeedId) -> StreamFeedEntriesOutput:
+    """
+    Stream all entries for a feed, only asking Feedbin for the entries created since the previous sync.
+
+    A local index of every entry ID in the feed and the newest created_at seen so far (its high-water mark) is kept
+    in .local_cache/. The first sync walks the feed's whole history; later syncs pass the high-water mark as `since`,
+    so their cost grows with the number of new entries instead of the size of the feed's history. The indexed IDs
+    are yielded first, then each new page's entries as it arrives.
+
+    The first page is fetched right away so a missing or forbidden feed is reported like in get_feed_entries. Later
+    pages are fetched while the iterator is consumed, so an HTTPError on one of them is raised to the consumer.
+
+    The index is updated once the stream is fully consumed. It only holds IDs, so it stays small even for a long
+    history, and it's rebuilt with a full walk every ENTRY_INDEX_REBUILD_INTERVAL to drop entries Feedbin no longer has.
+
+    Docs:
+    - https://github.com/feedbin/feedbin-api/blob/master/content/entries.md#get-v2feeds203entriesjson
+    """
+    index_key = f"{API}/feeds/{feed_id}/entries.json#index"
+    index = entry_index.get(index_key) or {"since": None, "ids": []}
+    indexed: list[int] = index["ids"]
+
+    request_args = RequestArgs(
+        url=f"{API}/feeds/{feed_id}/entries.json",
+        params={"since": index["since"]},
+    )
+
+    def sync(pages: Iterator[Page]) -> Iterator[Entry]:
+        since: str | None = index["since"]
+        ids = dict.fromkeys(indexed)  # keeps the order entries were first seen in
+        yield from (Entry(id=id) for id in indexed)
+
+        for page in pages:
+            for entry in page:
+                if entry["id"] not in ids:
+                    ids[entry["id"]] = None
+                    yield Entry(id=entry["id"])
+                created_at = entry.get("created_at")
+                # ISO 8601 timestamps in the same format and timezone sort lexicographically
+                if created_at and (since is None or created_at > since):
+                    since = created_at
+
+        entry_index.set(
+            index_key, {"since": since, "ids": list(ids)}, ttl=ENTRY_INDEX_REBUILD_INTERVAL
+        )
+
+    try:
+        pages = iter_paginated_request(request_args)
+        first_page = next(pages, [])
+        return GetFeedEntriesResult.OK, sync(chain([first_page], pages))
+    except HTTPError as e:
+        match e.response.status_code:
+            case 403:
+                return GetFeedEntriesResult.FORBIDDEN, feed_id
+            case 404:
+                return GetFeedEntriesResult.NOT_FOUND, feed_id
+        return GetFeedEntriesResult.HTTP_ERROR, str(e)
+    except Exception as e:
+        return GetFeedEntriesResult.UNEXPECTED_ERROR, str(e)
+
+
+def sync_feed_entries(feed_id: FeedId) -> GetFeedEntriesOutput:
+    """Get all entries for a feed, only asking Feedbin for those created since the previous sync (sorted by ID)."""
+    result, entries = stream_sync_feed_entries(feed_id)
+
+    if result != GetFeedEntriesResult.OK or not isinstance(entries, Iterator):
+        return result, entries  # type: ignore[return-value]
+
+    try:
+        return GetFeedEntriesResult.OK, sorted(entries, key=lambda entry: entry.id)
+    except HTTPError as e:
+        return GetFeedEntriesResult.HTTP_ERROR, str(e)
+    except Exception as e:
+        return GetFeedEntriesResult.UNEXPECTED_ERROR, str(e)
@@ -0,0 +1,106 @@
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from common.cache import DiskCache
+from rss.domain import FeedId
+from rss.entries.list import feedbin
+from rss.entries.list.feedbin import (
+    GetFeedEntriesResult,
+    get_feed_entries,
+    stream_sync_feed_entries,
+    sync_feed_entries,
+)
+from rss.utils.feedbin import RequestArgs
+
+FEED_ID = FeedId(1)
+CREATED_AT_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"  # e.g. "2013-02-19T07:33:55.404434Z"
+
+
+def days_ago(days: int) -> str:
+    return (datetime.now(UTC) - timedelta(days=days)).strftime(CREATED_AT_FORMAT)
+
+
+class FakeFeed:
+    """Serves a feed's entries (newest first) in place of iter_paginated_request, honoring `since`."""
+
+    def __init__(self) -> None:
+        self.entries: list[dict[str, Any]] = []
+        self.requested_since: list[str | None] = []
+
+    def add(self, id: int, created_at: str) -> None:
+        self.entries.insert(0, {"id": id, "created_at": created_at})
+
+    def created_at(self, id: int) -> str:
+        return str(next(e["created_at"] for e in self.entries if e["id"] == id))
+
+    def __call__(self, request_args: RequestArgs) -> Iterator[list[dict[str, Any]]]:
+        since = (request_args.params or {}).get("since")
+        self.requested_since.append(since)
+        yield [e for e in self.entries if since is None or e["created_at"] > since]
+
+
+@pytest.fixture
+def feed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FakeFeed:
+    fake = FakeFeed()
+    monkeypatch.delenv("NO_CACHE", raising=False)
+    monkeypatch.setattr(feedbin, "iter_paginated_request", fake)
+    monkeypatch.setattr(feedbin, "entry_index", DiskCache("entries", cache_dir=str(tmp_path)))
+    return fake
+
+
+def synced_ids() -> list[int]:
+    result, entries = sync_feed_entries(FEED_ID)
+    assert result == GetFeedEntriesResult.OK and isinstance(entries, list)
+    return [entry.id for entry in entries]
+
+
+class TestSyncFeedEntries:
+    def test_later_syncs_only_ask_for_new_entries(_, feed: FakeFeed) -> None:
+        feed.add(1, days_ago(3))
+        feed.add(2, days_ago(2))
+        assert synced_ids() == [1, 2]
+
+        feed.add(3, days_ago(1))
+        assert synced_ids() == [1, 2, 3]
+
+        assert feed.requested_since == [None, feed.created_at(2)]
+
+    def test_old_entries_are_still_returned_by_later_syncs(_, feed: FakeFeed) -> None:
+        feed.add(1, days_ago(2000))
+        feed.add(2, days_ago(1))
+
+        assert synced_ids() == [1, 2]
+        feed.add(3, days_ago(0))
+        assert synced_ids() == [1, 2, 3]
+
+        assert feed.requested_since == [None, feed.created_at(2)]
+
+    def test_the_index_is_only_updated_once_the_stream_is_consumed(_, feed: FakeFeed) -> None:
+        feed.add(1, days_ago(1))
+
+        result = stream_sync_feed_entries(FEED_ID)[0]  # the stream is never consumed
+        assert result == GetFeedEntriesResult.OK
+
+        assert synced_ids() == [1]
+        assert feed.requested_since == [None, None]
+
+
+class TestGetFeedEntries:
+    def test_read_filtered_results_are_not_cached(
+        _, feed: FakeFeed, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            feedbin, "response_cache", DiskCache("feedbin", cache_dir=str(tmp_path))
+        )
+        feed.add(1, days_ago(1))
+
+        get_feed_entries(FEED_ID, read=False)
+        get_feed_entries(FEED_ID, read=False)
+        get_feed_entries(FEED_ID)
+        get_feed_entries(FEED_ID)
+
+        assert len(feed.requested_since) == 3  # both filtered calls, then the first unfiltered one
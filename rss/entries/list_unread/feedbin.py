@@ -0,0 +1,49 @@
+"""Feedbin API interactions for listing the IDs of every unread entry in the account."""
+
+from enum import Enum
+from typing import Literal
+
+from requests import HTTPError
+
+from rss.domain import EntryIdSet
+from rss.utils.feedbin import API, HTTPMethod, RequestArgs, make_request
+
+
+class GetUnreadEntriesResult(str, Enum):
+    OK = "✅ Unread entry IDs found"
+    UNEXPECTED_STATUS_CODE = "🚨 Unexpected status code while getting unread entry IDs"
+    HTTP_ERROR = "🚨 HTTP error while getting unread entry IDs"
+    UNEXPECTED_ERROR = "🚨 Unexpected error while getting unread entry IDs"
+
+
+GetUnreadEntriesOutput = (
+    tuple[Literal[GetUnreadEntriesResult.OK], EntryIdSet]
+    | tuple[Literal[GetUnreadEntriesResult.UNEXPECTED_STATUS_CODE], int]
+    | tuple[Literal[GetUnreadEntriesResult.HTTP_ERROR], str]
+    | tuple[Literal[GetUnreadEntriesResult.UNEXPECTED_ERROR], str]
+)
+
+
+def get_unread_entries() -> GetUnreadEntriesOutput:
+    """
+    Get the IDs of all unread entries across every subscription.
+
+    The IDs come back as one (unpaginated) array, which is stored as a compact EntryIdSet.
+
+    Docs:
+    - https://github.com/feedbin/feedbin-api/blob/master/content/unread-entries.md#get-unread-entries
+    """
+    request_args = RequestArgs(url=f"{API}/unread_entries.json")
+
+    try:
+        response = make_request(HTTPMethod.GET, request_args)
+
+        match response.status_code:
+            case 200:
+                return GetUnreadEntriesResult.OK, EntryIdSet(response.json())
+            case _:
+                return GetUnreadEntriesResult.UNEXPECTED_STATUS_CODE, response.status_code
+    except HTTPError as e:
+        return GetUnreadEntriesResult.HTTP_ERROR, str(e)
+    except Exception as e:
+        return GetUnreadEntriesResult.UNEXPECTED_ERROR, str(e)
@@ -1,15 +1,20 @@
 """Feedbin API interactions for marking RSS feed entries as unread."""
 
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
+from itertools import batched
 from typing import Literal
 
-from requests import HTTPError
+from requests import HTTPError, Response
 
-from rss.domain import EntryId
+from rss.domain import EntryId, EntryIdSet
 from rss.utils.feedbin import API, HTTPMethod, RequestArgs, make_request
 
 MAX_ENTRIES_PER_BATCH = 1000
+MAX_BATCHES_IN_FLIGHT = 3
 
 
 class CreateUnreadEntriesResult(str, Enum):
@@ -23,6 +28,7 @@ class CreateUnreadEntriesResult(str, Enum):
 class UnreadEntriesResponse:
     marked_as_unread: list[EntryId]
     not_marked_as_unread: list[EntryId]
+    already_unread: list[EntryId] = field(default_factory=list)  # skipped without being sent
 
 
 CreateUnreadEntriesOutput = (
@@ -33,9 +39,29 @@ CreateUnreadEntriesOutput = (
 )
 
 
-def create_unread_entries(entry_ids: list[EntryId]) -> CreateUnreadEntriesOutput:
+def _post_batch(batch: list[EntryId]) -> tuple[list[EntryId], Response]:
+    request_args = RequestArgs(
+        url=f"{API}/unread_entries.json",
+        json={"unread_entries": batch},
+    )
+    return batch, make_request(HTTPMethod.POST, request_args)
+
+
+def create_unread_entries(
+    entry_ids: Iterable[EntryId],
+    *,
+    max_in_flight: int = MAX_BATCHES_IN_FLIGHT,
+    already_unread: EntryIdSet | None = None,
+) -> CreateUnreadEntriesOutput:
     """
-    Mark up to 1,000 entry IDs as unread.
+    Mark entry IDs as unread, in batches of up to 1,000 IDs.
+
+    The IDs can be a lazy iterable (e.g. from stream_sync_feed_entries), in which case each batch is sent as soon as
+    enough IDs have arrived, and an error while producing the IDs is reported like an error while sending them.
+    Up to max_in_flight batches are sent at the same time while the next batch is being collected.
+
+    If already_unread is given (see get_unread_entries), IDs in it are left out of the batches, since marking them
+    again would change nothing.
 
     The response will contain all of the entry IDs that were successfully marked as unread.
     If any IDs that were sent are not returned in the response, it usually means the user
@@ -46,32 +72,49 @@ def create_unread_entries(entry_ids: list[EntryId]) -> CreateUnreadEntriesOutput
     """
     marked_as_unread: set[int] = set()
     not_marked_as_unread: set[int] = set()
-
-    for i in range(0, len(entry_ids), MAX_ENTRIES_PER_BATCH):
-        batch = entry_ids[i : i + MAX_ENTRIES_PER_BATCH]
-
-        request_args = RequestArgs(
-            url=f"{API}/unread_entries.json",
-            json={"unread_entries": batch},
-        )
-
-        try:
-            response = make_request(HTTPMethod.POST, request_args)
-
-            match response.status_code:
-                case 200:
-                    ids_marked_unread: set[int] = {int(id) for id in response.json()}
-                    ids_not_marked_unread: set[int] = set(batch) - set(ids_marked_unread)
-                    marked_as_unread.update(ids_marked_unread)
-                    not_marked_as_unread.update(ids_not_marked_unread)
-                case _:
-                    return CreateUnreadEntriesResult.UNEXPECTED_STATUS_CODE, response.status_code
-        except HTTPError as e:
-            return CreateUnreadEntriesResult.HTTP_ERROR, str(e)
-        except Exception as e:
-            return CreateUnreadEntriesResult.UNEXPECTED_ERROR, str(e)
+    skipped: list[EntryId] = []
+
+    def needs_marking(entry_id: EntryId) -> bool:
+        if already_unread is not None and entry_id in already_unread:
+            skipped.append(entry_id)
+            return False
+        return True
+
+    def collect(sent: Future[tuple[list[EntryId], Response]]) -> int | None:
+        """Record the outcome of a sent batch, returning the status code if it was unexpected."""
+        batch, response = sent.result()
+
+        match response.status_code:
+            case 200:
+                ids_marked_unread: set[int] = {int(id) for id in response.json()}
+                ids_not_marked_unread: set[int] = set(batch) - set(ids_marked_unread)
+                marked_as_unread.update(ids_marked_unread)
+                not_marked_as_unread.update(ids_not_marked_unread)
+                return None
+            case _:
+                return response.status_code
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as executor:
+            in_flight: deque[Future[tuple[list[EntryId], Response]]] = deque()
+
+            for batch in batched(filter(needs_marking, entry_ids), MAX_ENTRIES_PER_BATCH):
+                if len(in_flight) >= max_in_flight:
+                    if (status_code := collect(in_flight.popleft())) is not None:
+                        return CreateUnreadEntriesResult.UNEXPECTED_STATUS_CODE, status_code
+
+                in_flight.append(executor.submit(_post_batch, list(batch)))
+
+            while in_flight:
+                if (status_code := collect(in_flight.popleft())) is not None:
+                    return CreateUnreadEntriesResult.UNEXPECTED_STATUS_CODE, status_code
+    except HTTPError as e:
+        return CreateUnreadEntriesResult.HTTP_ERROR, str(e)
+    except Exception as e:
+        return CreateUnreadEntriesResult.UNEXPECTED_ERROR, str(e)
 
     return CreateUnreadEntriesResult.OK, UnreadEntriesResponse(
         marked_as_unread=[EntryId(id) for id in marked_as_unread],
         not_marked_as_unread=[EntryId(id) for id in not_marked_as_unread],
+        already_unread=skipped,
     )
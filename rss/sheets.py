@@ -22,7 +22,11 @@ Step 3: Share Google Sheet
 - Share the sheet with the service account email (found in the JSON key file).
 """
 
+import asyncio
+import hashlib
 import json
+import os
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from enum import Enum
 from itertools import groupby
@@ -33,25 +37,38 @@ from google.oauth2.service_account import Credentials
 from gspread.auth import authorize
 from gspread.client import Client
 from gspread.worksheet import Worksheet
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from requests import HTTPError
 from rich.console import Console
 from rich.table import Table
 
-from common.logs import log
+from common.journal import Journal, JournalRecord
+from common.logs import LogFields, log, log_fields
+from common.pushover import SECRETS as PUSHOVER_SECRETS
 from common.pushover import send_notification
-from common.secrets import get_secret
-from rss.domain import EntryId, FeedId, FeedUrl, Subscription, SubscriptionId
-from rss.entries.list.feedbin import GetFeedEntriesResult, get_feed_entries
+from common.secrets import get_secret, load_secrets
+from rss.domain import Entry, EntryId, EntryIdSet, FeedId, FeedUrl, Subscription, SubscriptionId
+from rss.entries.list.feedbin import GetFeedEntriesResult, stream_sync_feed_entries
+from rss.entries.list_unread.feedbin import get_unread_entries
 from rss.entries.mark_unread.feedbin import CreateUnreadEntriesResult, create_unread_entries
 from rss.subscriptions.add.feedbin import CreateSubscriptionResult, create_subscription
+from rss.subscriptions.index import SubscriptionIndex, load_subscription_index
 from rss.subscriptions.update.feedbin import UpdateSubscriptionResult, update_subscription
 from rss.subscriptions.update.main import generate_new_title
+from rss.utils.feedbin import SECRETS as FEEDBIN_SECRETS
+from rss.utils.feedbin import call_async, request_metrics
+from rss.utils.sheets import SheetWriteBuffer
 
 GOOGLE_CLOUD_SCOPES = [
     "https://spreadsheets.google.com/feeds",
     "https://www.googleapis.com/auth/drive",
 ]
 SHEET_NAME = "RSS Feed Wish List 🔖"
+METRICS_FILE = ".logs/feedbin-requests.json"  # per-endpoint request metrics from the latest run
+JOURNAL_NAME = "sheets-journal"  # every row update of an unfinished run (see resume_rows)
+
+GOOGLE_SERVICE_ACCOUNT_KEY = ("Google Cloud Service Account Key", "michael-uloth-f8d0e53fdb41.json")
+SECRETS = (GOOGLE_SERVICE_ACCOUNT_KEY, *FEEDBIN_SECRETS, *PUSHOVER_SECRETS)
 
 
 class ColumnName(str, Enum):
@@ -85,6 +102,13 @@ class Row(BaseModel):
     subscribed: bool
     marked_unread: bool
     suffix_added: bool
+    # Hash of the row's C:I values as they were read from the sheet (see parse_rows)
+    fingerprint: str = Field(default="", exclude=True, repr=False)
+
+
+def row_log_fields(row: Row) -> dict[str, LogFields]:
+    """Identify the row a log record is about (see LOG_FORMAT=json in common/logs.py)."""
+    return log_fields(row_index=row.index, status=row.status)
 
 
 JsonParsed = dict[str, str]
@@ -112,6 +136,30 @@ SheetsCellValue = str | int | float
 UnparsedRow = dict[SheetsColumnName, SheetsCellValue]
 
 
+def serialize_row(row: Row) -> list[SheetsCellValue]:
+    """Convert the row to the values stored in columns C to I of the sheet."""
+    return [
+        row.subscribed,
+        row.marked_unread,
+        row.suffix_added,
+        row.status.value,
+        row.subscription_id,
+        row.feed_id,
+        str(row.details),
+    ]
+
+
+def fingerprint_row(row: Row) -> str:
+    """Hash the row's serialized C:I values so unchanged rows can be detected without comparing every field."""
+    serialized = json.dumps(serialize_row(row), ensure_ascii=False).encode()
+    return hashlib.blake2b(serialized, digest_size=16).hexdigest()
+
+
+def row_range(row_index: int) -> str:
+    """The A1 range of the row's columns C to I (the ones written by these scripts)."""
+    return f"C{row_index}:I{row_index}"
+
+
 def parse_rows(unparsed_rows: list[UnparsedRow]) -> list[Row]:
     """Get the parsed rows from the Google Sheet."""
 
@@ -125,22 +173,101 @@ def parse_rows(unparsed_rows: list[UnparsedRow]) -> list[Row]:
     def parse_int(value: SheetsCellValue) -> int | Literal[""]:
         return int(value) if value else ""
 
+    def with_fingerprint(row: Row) -> Row:
+        return row.model_copy(update={"fingerprint": fingerprint_row(row)})
+
     return [
-        Row(
-            index=i,
-            url=parse_str(row[ColumnName.URL]),
-            status=Status(row[ColumnName.STATUS]) if row[ColumnName.STATUS] else Status.NEW,
-            subscription_id=parse_int(row[ColumnName.SUBSCRIPTION_ID]),
-            feed_id=parse_int(row[ColumnName.FEED_ID]),
-            details=parse_str(row[ColumnName.DETAILS]),
-            subscribed=parse_checkbox(row.get(ColumnName.SUBSCRIBED, "")),
-            marked_unread=parse_checkbox(row.get(ColumnName.MARKED_UNREAD, "")),
-            suffix_added=parse_checkbox(row.get(ColumnName.SUFFIX_ADDED, "")),
+        with_fingerprint(
+            Row(
+                index=i,
+                url=parse_str(row[ColumnName.URL]),
+                status=Status(row[ColumnName.STATUS]) if row[ColumnName.STATUS] else Status.NEW,
+                subscription_id=parse_int(row[ColumnName.SUBSCRIPTION_ID]),
+                feed_id=parse_int(row[ColumnName.FEED_ID]),
+                details=parse_str(row[ColumnName.DETAILS]),
+                subscribed=parse_checkbox(row.get(ColumnName.SUBSCRIBED, "")),
+                marked_unread=parse_checkbox(row.get(ColumnName.MARKED_UNREAD, "")),
+                suffix_added=parse_checkbox(row.get(ColumnName.SUFFIX_ADDED, "")),
+            )
         )
         for i, row in enumerate(unparsed_rows, start=2)  # skip header row
     ]
 
 
+def journal_record(row: Row) -> JournalRecord:
+    """The row's state after a stage, as recorded in the run journal."""
+    return row.model_dump(mode="json")
+
+
+def resume_rows(rows: list[Row], records: list[JournalRecord]) -> list[Row]:
+    """
+    Apply the latest journal record for each row, so stages an earlier run finished are not repeated.
+
+    Records for a row whose URL has since changed are ignored. Resumed rows keep the fingerprint of the values read
+    from the sheet, so the sheet can be caught up with them (see reconcile_rows).
+    """
+    latest = {record["index"]: record for record in records}
+    resumed_rows = []
+
+    for row in rows:
+        record = latest.get(row.index)
+        if record is None or record.get("url") != row.url:
+            resumed_rows.append(row)
+            continue
+
+        resumed_row = Row.model_validate(record).model_copy(update={"fingerprint": row.fingerprint})
+        log.debug("⏩ resumed_row: %s", resumed_row, extra=row_log_fields(resumed_row))
+        resumed_rows.append(resumed_row)
+
+    return resumed_rows
+
+
+def reconcile_rows(rows: list[Row], writes: SheetWriteBuffer) -> list[Row]:
+    """
+    Write every row the sheet is behind on (e.g. after resume_rows) in one bulk write.
+
+    Returns the rows fingerprinted with the values the sheet now holds.
+    """
+    stale_rows = {
+        row.index: row
+        for row in rows
+        if row.fingerprint and fingerprint_row(row) != row.fingerprint
+    }
+
+    if not stale_rows:
+        return rows
+
+    log.info(f"📝 Catching the sheet up on {len(stale_rows)} rows from the last run")
+    writes.write_many({row_range(i): [serialize_row(row)] for i, row in stale_rows.items()})
+
+    return [
+        row.model_copy(update={"fingerprint": fingerprint_row(row)})
+        if row.index in stale_rows
+        else row
+        for row in rows
+    ]
+
+
+@dataclass
+class RunContext:
+    """Lookups loaded once per run and shared by every row."""
+
+    already_unread: EntryIdSet | None = None  # IDs that don't need to be marked unread again
+    subscriptions: SubscriptionIndex | None = None  # kept up to date as rows subscribe and rename
+    journal: Journal | None = None  # records every row update, so a failed run can be resumed
+
+
+def load_run_context() -> RunContext:
+    """Fetch the account-wide lookups used while processing rows (skipping any that fail to load)."""
+    result, already_unread = get_unread_entries()
+    log.debug(f"{result.value}: {already_unread}")
+
+    return RunContext(
+        already_unread=already_unread if isinstance(already_unread, EntryIdSet) else None,
+        subscriptions=load_subscription_index(),
+    )
+
+
 @dataclass
 class FeedbinApiCalls:
     subscribe: list[Row] | None = None
@@ -168,12 +295,17 @@ def plan_api_calls(rows: list[Row]) -> FeedbinApiCalls:
     return calls
 
 
-def subscribe_and_return_updated_row(row: Row) -> Row:
-    """Subscribe to a URL and return the updated row."""
+def subscribe_and_return_updated_row(
+    row: Row,
+    subscriptions: SubscriptionIndex | None = None,
+) -> Row:
+    """Subscribe to a URL and return the updated row (recording the subscription in the index, if given)."""
     result, data = create_subscription(url=row.url)
 
     match result:
         case CreateSubscriptionResult.CREATED | CreateSubscriptionResult.EXISTS:
+            if subscriptions is not None and isinstance(data, Subscription):
+                subscriptions.add(data)
             return row.model_copy(
                 update={
                     "status": Status.SUBSCRIBED,
@@ -197,9 +329,54 @@ def subscribe_and_return_updated_row(row: Row) -> Row:
             return row.model_copy(update={"status": Status.ERROR, "details": f"{result}: {data}"})
 
 
-def mark_backlog_unread_and_return_updated_row(row: Row, entry_ids: list[EntryId]) -> Row:
+class EntryIdStream(Iterator[EntryId]):
+    """A backlog's entry IDs, streamed page by page, remembering why the listing failed (if a later page did)."""
+
+    def __init__(self, entries: Iterator[Entry]) -> None:
+        self._entries = entries
+        self.error: str | None = None
+
+    def __next__(self) -> EntryId:
+        try:
+            return EntryId(next(self._entries).id)
+        except StopIteration:
+            raise
+        except HTTPError as e:
+            self.error = f"{GetFeedEntriesResult.HTTP_ERROR}: {e}"
+            raise
+        except Exception as e:
+            self.error = f"{GetFeedEntriesResult.UNEXPECTED_ERROR}: {e}"
+            raise
+
+
+def get_backlog_entry_ids_or_updated_row(row: Row) -> EntryIdStream | Row:
+    """
+    Start streaming the subscription's backlog entry IDs, or return the row updated with the reason that failed.
+
+    Only entries created since the feed was last synced are fetched from Feedbin, page by page while the IDs are
+    consumed (see stream_sync_feed_entries). If a later page fails, the stream's error is set, so the row can be
+    handled like one whose first page failed.
+    """
+    if not isinstance(row.feed_id, FeedId):
+        return row.model_copy(
+            update={"status": Status.ERROR, "details": "Feed ID must be set when listing entries"}
+        )
+
+    result, entries = stream_sync_feed_entries(feed_id=row.feed_id)
+
+    if result != GetFeedEntriesResult.OK or not isinstance(entries, Iterator):
+        return row.model_copy(update={"details": f"{result}: {entries}"})
+
+    return EntryIdStream(entries)
+
+
+def mark_backlog_unread_and_return_updated_row(
+    row: Row,
+    entry_ids: Iterable[EntryId],
+    already_unread: EntryIdSet | None = None,
+) -> Row:
     """Mark subscription's entire backlog as unread and return the updated row."""
-    result, data = create_unread_entries(entry_ids)
+    result, data = create_unread_entries(entry_ids, already_unread=already_unread)
 
     match result:
         case CreateUnreadEntriesResult.OK:
@@ -214,8 +391,15 @@ def mark_backlog_unread_and_return_updated_row(row: Row, entry_ids: list[EntryId
             return row.model_copy(update={"status": Status.ERROR, "details": f"{result}: {data}"})
 
 
-def add_title_suffix_and_return_updated_row(row: Row) -> Row:
-    """Append 📖 or 📺 to subscription title and return the updated row."""
+def add_title_suffix_and_return_updated_row(
+    row: Row,
+    subscriptions: SubscriptionIndex | None = None,
+) -> Row:
+    """
+    Append 📖 or 📺 to subscription title and return the updated row.
+
+    The current title is read from the subscriptions index when possible, so no extra request is needed.
+    """
     if not isinstance(row.subscription_id, SubscriptionId):
         return row.model_copy(
             update={
@@ -224,7 +408,7 @@ def add_title_suffix_and_return_updated_row(row: Row) -> Row:
             }
         )
 
-    new_title = generate_new_title(row.subscription_id)
+    new_title = generate_new_title(row.subscription_id, subscriptions)
 
     if new_title is None:
         return row.model_copy(
@@ -235,6 +419,8 @@ def add_title_suffix_and_return_updated_row(row: Row) -> Row:
 
     match result:
         case UpdateSubscriptionResult.OK:
+            if subscriptions is not None and isinstance(data, Subscription):
+                subscriptions.add(data)
             return row.model_copy(
                 update={
                     "status": Status.SUFFIX_ADDED,
@@ -254,73 +440,171 @@ def add_title_suffix_and_return_updated_row(row: Row) -> Row:
             return row.model_copy(update={"status": Status.ERROR, "details": f"{result}: {data}"})
 
 
-# TODO: return what happened
 def update_row(
     *,
     row: Row,
     row_index: int,
-    sheet: Worksheet,
-) -> None:
-    """Update the row in the Google Sheet."""
-
-    row_range = f"C{row_index}:I{row_index}"  # columns C to F of the row
-    row_values = [
-        [
-            row.subscribed,
-            row.marked_unread,
-            row.suffix_added,
-            row.status.value,
-            row.subscription_id,
-            row.feed_id,
-            str(row.details),
-        ]
-    ]
+    writes: SheetWriteBuffer,
+    journal: Journal | None = None,
+) -> Row:
+    """
+    Queue an update of the row in the Google Sheet (sent in bulk when the buffer flushes).
+
+    The update is recorded in the journal first (if given), so it isn't lost if the run dies before the next flush.
+    Rows whose C:I values match the last ones read or queued for them are skipped. Returns the row fingerprinted
+    with the values queued, so the next update of the row is compared against them.
+    """
+    if journal is not None:
+        journal.append(journal_record(row))
+
+    fingerprint = fingerprint_row(row)
+    if fingerprint == row.fingerprint:
+        return row
 
-    sheet.update(row_values, row_range)
+    writes.write(row_range(row_index), [serialize_row(row)])
+    return row.model_copy(update={"fingerprint": fingerprint})
 
 
-def process_rows(rows: list[Row], sheet: Worksheet) -> list[Row]:
+def process_rows(
+    rows: list[Row],
+    writes: SheetWriteBuffer,
+    context: RunContext | None = None,
+) -> list[Row]:
     """
     TODO:
     - Accumulate API calls and return them to be made in bulk later?
     - Recursively call until all rows are in a terminal state?
-    - Make one bulk spreadsheet update at the end instead of defensively updating status throughout?
     """
 
+    context = context or RunContext()
     processed_rows: list[Row] = []
 
+    def save(row: Row) -> Row:
+        log.debug("🔍 updated_row: %s", row, extra=row_log_fields(row))
+        return update_row(row=row, row_index=row.index, writes=writes, journal=context.journal)
+
     for row in rows:
         processed_row = row
 
         if row.subscribed is False:
-            processed_row = subscribe_and_return_updated_row(row)
-            update_row(row=processed_row, row_index=processed_row.index, sheet=sheet)
-            log.debug(f"🔍 updated_row: {processed_row}")
+            processed_row = save(subscribe_and_return_updated_row(row, context.subscriptions))
 
         if row.marked_unread is False and isinstance(processed_row.feed_id, FeedId):
-            result, entries = get_feed_entries(feed_id=processed_row.feed_id)
-            if result != GetFeedEntriesResult.OK or not isinstance(entries, list):
-                processed_row = processed_row.model_copy(update={"details": f"{result}: {entries}"})
-                log.debug(f"🔍 updated_row: {processed_row}")
-                update_row(row=processed_row, row_index=processed_row.index, sheet=sheet)
-                processed_rows.append(processed_row)
+            entry_ids = get_backlog_entry_ids_or_updated_row(processed_row)
+            if isinstance(entry_ids, Row):
+                processed_rows.append(save(entry_ids))
+                continue
+
+            marked_row = mark_backlog_unread_and_return_updated_row(
+                processed_row, entry_ids, context.already_unread
+            )
+            if entry_ids.error is not None:
+                # A later page failed, so stop here like when the first page fails
+                processed_rows.append(
+                    save(processed_row.model_copy(update={"details": entry_ids.error}))
+                )
                 continue
 
-            entry_ids = [EntryId(entry.id) for entry in entries]
-            processed_row = mark_backlog_unread_and_return_updated_row(processed_row, entry_ids)
-            log.debug(f"🔍 updated_row: {processed_row}")
-            update_row(row=processed_row, row_index=processed_row.index, sheet=sheet)
+            processed_row = save(marked_row)
 
         if row.suffix_added is False and isinstance(processed_row.subscription_id, SubscriptionId):
-            processed_row = add_title_suffix_and_return_updated_row(processed_row)
-            log.debug(f"🔍 updated_row: {processed_row}")
-            update_row(row=processed_row, row_index=processed_row.index, sheet=sheet)
+            processed_row = save(
+                add_title_suffix_and_return_updated_row(processed_row, context.subscriptions)
+            )
 
         processed_rows.append(processed_row)
 
     return processed_rows
 
 
+@dataclass(frozen=True)
+class PipelineWorkers:
+    """How many rows each stage of the pipeline may work on at the same time."""
+
+    subscribe: int = 4
+    mark_unread: int = 2  # each row may page through a large backlog and post several batches
+    add_suffix: int = 4
+
+
+DEFAULT_PIPELINE_WORKERS = PipelineWorkers()
+
+
+async def process_rows_pipelined(
+    rows: list[Row],
+    writes: SheetWriteBuffer,
+    calls: FeedbinApiCalls,
+    workers: PipelineWorkers = DEFAULT_PIPELINE_WORKERS,
+    context: RunContext | None = None,
+) -> list[Row]:
+    """
+    Run the same steps as process_rows, but as a staged pipeline.
+
+    Every row moves through subscribe → mark unread → add suffix on its own, so a row can start the next stage as
+    soon as it finishes the previous one while other rows are still waiting on theirs. Each stage has its own cap on
+    how many rows it works on at once, and only the rows planned for a stage (see plan_api_calls) enter it.
+    """
+    context = context or RunContext()
+    to_subscribe = {row.index for row in calls.subscribe or []}
+    to_mark_unread = {row.index for row in calls.mark_unread or []}
+    to_add_suffix = {row.index for row in calls.add_suffix or []}
+
+    subscribe_slots = asyncio.Semaphore(workers.subscribe)
+    mark_unread_slots = asyncio.Semaphore(workers.mark_unread)
+    add_suffix_slots = asyncio.Semaphore(workers.add_suffix)
+
+    async def save(row: Row) -> Row:
+        log.debug("🔍 updated_row: %s", row, extra=row_log_fields(row))
+        # may block on a flush to the sheet, so keep it off the event loop
+        return await asyncio.to_thread(
+            update_row, row=row, row_index=row.index, writes=writes, journal=context.journal
+        )
+
+    async def process_row(row: Row) -> Row:
+        processed_row = row
+
+        if row.index in to_subscribe:
+            processed_row = await call_async(
+                subscribe_slots,
+                subscribe_and_return_updated_row,
+                processed_row,
+                context.subscriptions,
+            )
+            processed_row = await save(processed_row)
+
+        if row.index in to_mark_unread and isinstance(processed_row.feed_id, FeedId):
+            entry_ids = await call_async(
+                mark_unread_slots, get_backlog_entry_ids_or_updated_row, processed_row
+            )
+            if isinstance(entry_ids, Row):
+                return await save(entry_ids)
+
+            marked_row = await call_async(
+                mark_unread_slots,
+                mark_backlog_unread_and_return_updated_row,
+                processed_row,
+                entry_ids,
+                context.already_unread,
+            )
+            if entry_ids.error is not None:
+                # A later page failed, so stop here like when the first page fails
+                return await save(processed_row.model_copy(update={"details": entry_ids.error}))
+
+            processed_row = await save(marked_row)
+
+        if row.index in to_add_suffix and isinstance(processed_row.subscription_id, SubscriptionId):
+            processed_row = await call_async(
+                add_suffix_slots,
+                add_title_suffix_and_return_updated_row,
+                processed_row,
+                context.subscriptions,
+            )
+            processed_row = await save(processed_row)
+
+        return processed_row
+
+    return list(await asyncio.gather(*(process_row(row) for row in rows)))
+
+
 Title = str
 Html = str
 
@@ -379,24 +663,42 @@ def generate_results_table(rows: list[Row]) -> Table:
     return table
 
 
-def main() -> None:
+def main(*, pipeline: bool = False, workers: PipelineWorkers = DEFAULT_PIPELINE_WORKERS) -> None:
     """Subscribe to URLs saved in a Google Sheet and update the sheet with the result."""
+    pipeline = os.getenv("PIPELINE") == "true" or pipeline
 
     # I/O
-    service_account_info = json.loads(
-        get_secret("Google Cloud Service Account Key", "michael-uloth-f8d0e53fdb41.json")
-    )
+    load_secrets(SECRETS)
+    service_account_info = json.loads(get_secret(*GOOGLE_SERVICE_ACCOUNT_KEY))
     client = get_authenticated_sheets_client(service_account_info, GOOGLE_CLOUD_SCOPES)
     sheet = get_worksheet(client)
 
-    # Pure
-    rows = parse_rows(sheet.get_all_records())
+    # Pick up where the last run left off, if it didn't finish
+    journal = Journal(JOURNAL_NAME)
+    rows = resume_rows(parse_rows(sheet.get_all_records()), journal.records())
 
-    # api_calls = plan_api_calls(rows)
-    # log.debug(f"🔍 api_calls: {api_calls}")
+    api_calls = plan_api_calls(rows)
+    log.debug("🔍 api_calls: %s", api_calls)
+
+    # I/O (skipped when a resumed run has nothing left to ask Feedbin)
+    if api_calls.subscribe or api_calls.mark_unread or api_calls.add_suffix:
+        context = load_run_context()
+    else:
+        context = RunContext()
+    context.journal = journal
 
     # TODO: make pure + make the API calls in bulk later?
-    updated_rows = process_rows(rows, sheet)
+    with SheetWriteBuffer(sheet) as writes:
+        rows = reconcile_rows(rows, writes)
+        if pipeline:
+            updated_rows = asyncio.run(
+                process_rows_pipelined(rows, writes, api_calls, workers, context)
+            )
+        else:
+            updated_rows = process_rows(rows, writes, context)
+
+    # Every update has reached the sheet, so there's nothing left to resume
+    journal.clear()
 
     # FIXME: assertions are good before I/O, but once I/O has happened, I don't want to skip the notification
     # assert len(rows) == len(updated_rows), "Number of rows should not change"
@@ -408,6 +710,8 @@ def main() -> None:
     send_notification(title=title, html=html)
     console = Console()
     console.print(table)
+    console.print(request_metrics.summary_table())
+    request_metrics.export_json(METRICS_FILE)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,14 @@ from typing import Literal
 from requests import HTTPError
 
 from rss.domain import FeedOption, FeedUrl, Subscription
-from rss.utils.feedbin import API, HTTPMethod, RequestArgs, make_request
+from rss.utils.feedbin import (
+    API,
+    HTTPMethod,
+    RequestArgs,
+    cache_key,
+    make_request,
+    response_cache,
+)
 
 
 class CreateSubscriptionResult(str, Enum):
@@ -45,6 +52,7 @@ def create_subscription(url: FeedUrl) -> CreateSubscriptionOutput:
             case 200 | 302:
                 return CreateSubscriptionResult.EXISTS, Subscription(**response.json())
             case 201:
+                response_cache.invalidate(cache_key(request_args))  # the subscriptions list
                 return CreateSubscriptionResult.CREATED, Subscription(**response.json())
             case 300:
                 options = [FeedOption(**feed) for feed in response.json()]
@@ -6,11 +6,14 @@ from typing import Literal
 from requests import HTTPError
 
 from rss.domain import SubscriptionId
+from rss.subscriptions.list.feedbin import forget_subscription
 from rss.utils.feedbin import (
     API,
     HTTPMethod,
     RequestArgs,
+    cache_key,
     make_request,
+    response_cache,
 )
 
 
@@ -46,6 +49,11 @@ def delete_subscription(subscription_id: SubscriptionId) -> DeleteSubscriptionOu
 
         match response.status_code:
             case 204:
+                response_cache.invalidate(
+                    cache_key(request_args),
+                    cache_key(RequestArgs(url=f"{API}/subscriptions.json")),
+                )
+                forget_subscription(subscription_id)
                 return DeleteSubscriptionResult.NO_CONTENT, None
             case _:
                 return DeleteSubscriptionResult.UNEXPECTED_STATUS_CODE, response.status_code
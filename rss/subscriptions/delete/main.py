@@ -1,28 +1,81 @@
-"""Entry point for deleting an RSS feed subscription."""
-
-# TODO: support deleting based on a URL as well as an ID
-# > If an int, validate as an ID, then delete that subscription
-# > If a string, validate as a URL, then get list of all subscriptions, then find a match by site_url or feed_url and delete that subscription
+"""Entry point for deleting RSS feed subscriptions by ID or URL."""
 
 import sys
 
 from common.logs import log
-from rss.domain import SubscriptionId
+from rss.domain import SubscriptionId, Url
 from rss.subscriptions.delete.feedbin import delete_subscription
+from rss.subscriptions.index import SubscriptionIndex, load_subscription_index
+from rss.utils.feedbin import run_concurrently
+
+MAX_CONCURRENT_DELETES = 4
+
+
+def resolve_subscription_ids(
+    ids_or_urls: list[str],
+    subscriptions: SubscriptionIndex | None,
+) -> list[SubscriptionId]:
+    """
+    Turn each argument into a subscription ID.
+
+    Integers are treated as IDs; anything else is treated as a URL and matched against each subscription's feed and
+    site URLs (after normalizing both, so "https://www.example.com/" matches "example.com"). A site URL shared by
+    several subscriptions is skipped rather than guessed at; pass the feed URL or ID instead.
+    """
+    subscription_ids: list[SubscriptionId] = []
+
+    for id_or_url in ids_or_urls:
+        if id_or_url.isdigit():
+            subscription_ids.append(SubscriptionId(id_or_url))
+            continue
+
+        if subscriptions is None:
+            log.error(f"🚨 Unable to look up subscriptions, so skipping '{id_or_url}'")
+            continue
+
+        matches = subscriptions.find_all_by_url(Url(id_or_url))
+        if not matches:
+            log.warning(f"⛔️ No subscription found matching '{id_or_url}'")
+            continue
+
+        if len(matches) > 1:
+            candidates = ", ".join(f"{match.id} ({match.feed_url})" for match in matches)
+            log.warning(
+                f"⛔️ '{id_or_url}' matches {len(matches)} subscriptions, so skipping it (use one of their IDs or feed "
+                f"URLs instead): {candidates}"
+            )
+            continue
+
+        match = matches[0]
+
+        log.debug(f"🔍 '{id_or_url}' matches subscription {match.id} ({match.title})")
+        subscription_ids.append(match.id)
+
+    return list(dict.fromkeys(subscription_ids))  # drop duplicates, keeping the order
+
+
+def main(ids_or_urls: list[str]) -> None:
+    needs_lookup = any(not id_or_url.isdigit() for id_or_url in ids_or_urls)
+    subscriptions = load_subscription_index() if needs_lookup else None
+    subscription_ids = resolve_subscription_ids(ids_or_urls, subscriptions)
 
+    log.debug(f"💪 Deleting {len(subscription_ids)} subscriptions")
 
-def main(subscription_id: SubscriptionId) -> None:
-    log.debug(f"💪 Deleting subscription ID {subscription_id}")
+    results = run_concurrently(
+        delete_subscription, subscription_ids, max_concurrency=MAX_CONCURRENT_DELETES
+    )
 
-    result, data = delete_subscription(subscription_id)
-    log.debug(f"{result.value}: {data}")
+    for subscription_id, (result, data) in zip(subscription_ids, results, strict=True):
+        log.debug(f"{result.value}: {subscription_id if data is None else data}")
 
-    log.debug("👍 Done deleting subscription")
+    log.debug("👍 Done deleting subscriptions")
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: PYTHONPATH=. uv run rss/subscriptions/delete/main.py <subscription_id>")
+        print(
+            "Usage: PYTHONPATH=. uv run rss/subscriptions/delete/main.py <subscription_id_or_url> [...]"
+        )
         sys.exit(1)
 
-    main(SubscriptionId(sys.argv[1]))
+    main(sys.argv[1:])
@@ -6,7 +6,16 @@ from typing import Literal
 from requests import HTTPError
 
 from rss.domain import Subscription, SubscriptionId
-from rss.utils.feedbin import API, HTTPMethod, RequestArgs, make_request
+from rss.utils.feedbin import (
+    API,
+    HTTPMethod,
+    RequestArgs,
+    cache_key,
+    make_request,
+    response_cache,
+)
+
+CACHE_TTL = 60 * 60  # 1 hour in seconds
 
 
 class GetSubscriptionResult(str, Enum):
@@ -30,18 +39,22 @@ GetSubscriptionOutput = (
 
 def get_subscription(subscription_id: SubscriptionId) -> GetSubscriptionOutput:
     """
-    Get an existing RSS feed subscription.
+    Get an existing RSS feed subscription (served from the local cache for up to CACHE_TTL).
 
     Docs:
     - https://github.com/feedbin/feedbin-api/blob/master/content/subscriptions.md#get-subscription
     """
     request_args = RequestArgs(url=f"{API}/subscriptions/{subscription_id}.json")
 
+    if (cached := response_cache.get(cache_key(request_args))) is not None:
+        return GetSubscriptionResult.OK, Subscription(**cached)
+
     try:
         response = make_request(HTTPMethod.GET, request_args)
 
         match response.status_code:
             case 200:
+                response_cache.set(cache_key(request_args), response.json(), CACHE_TTL)
                 return GetSubscriptionResult.OK, Subscription(**response.json())
             case _:
                 return GetSubscriptionResult.UNEXPECTED_STATUS_CODE, response.status_code
@@ -0,0 +1,114 @@
+"""In-memory index of every subscription, for constant-time lookups by ID, feed ID or URL."""
+
+from dataclasses import dataclass, field
+from typing import Self
+from urllib.parse import urlsplit
+
+from common.logs import log
+from rss.domain import FeedId, Subscription, SubscriptionId, Url
+from rss.subscriptions.list.feedbin import sync_subscriptions
+
+NormalizedUrl = str
+
+
+def normalize_url(url: Url) -> NormalizedUrl:
+    """
+    Reduce a URL to the parts that identify a site or feed, so equivalent spellings match.
+
+    Drops the scheme, credentials, a leading "www.", default ports, fragments and trailing slashes, and lowercases
+    the host (paths and query strings are case-sensitive, so they're kept as is).
+
+    Example:
+     - "HTTPS://www.Example.com:443/blog/" -> "example.com/blog"
+    """
+    parts = urlsplit(url.strip() if "://" in url else f"//{url.strip()}")
+
+    host = (parts.hostname or "").removeprefix("www.")
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/")
+    query = f"?{parts.query}" if parts.query else ""
+
+    return f"{host}{path}{query}"
+
+
+def _discard[K](lookup: dict[K, Subscription], key: K, subscription: Subscription) -> None:
+    """Remove the key only if it still points at this subscription (another one may share the URL)."""
+    if lookup.get(key) is subscription:
+        del lookup[key]
+
+
+@dataclass
+class SubscriptionIndex:
+    by_id: dict[SubscriptionId, Subscription] = field(default_factory=dict)
+    by_feed_id: dict[FeedId, Subscription] = field(default_factory=dict)
+    by_feed_url: dict[NormalizedUrl, Subscription] = field(default_factory=dict)
+    # Several feeds (e.g. per-category or comments feeds) can share a site URL
+    by_site_url: dict[NormalizedUrl, list[Subscription]] = field(default_factory=dict)
+
+    @classmethod
+    def from_subscriptions(cls, subscriptions: list[Subscription]) -> Self:
+        index = cls()
+        for subscription in subscriptions:
+            index.add(subscription)
+        return index
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription (or replace the stored version of it)."""
+        self.remove(subscription.id)
+        self.by_id[subscription.id] = subscription
+        self.by_feed_id[subscription.feed_id] = subscription
+        self.by_feed_url[normalize_url(subscription.feed_url)] = subscription
+        self.by_site_url.setdefault(normalize_url(subscription.site_url), []).append(subscription)
+
+    def remove(self, subscription_id: SubscriptionId) -> Subscription | None:
+        """Remove a subscription from every lookup, returning it if it was indexed."""
+        subscription = self.by_id.pop(subscription_id, None)
+        if subscription is None:
+            return None
+
+        _discard(self.by_feed_id, subscription.feed_id, subscription)
+        _discard(self.by_feed_url, normalize_url(subscription.feed_url), subscription)
+
+        site_url = normalize_url(subscription.site_url)
+        site_subscriptions = [
+            other for other in self.by_site_url.get(site_url, []) if other is not subscription
+        ]
+        if site_subscriptions:
+            self.by_site_url[site_url] = site_subscriptions
+        else:
+            self.by_site_url.pop(site_url, None)
+
+        return subscription
+
+    def find_all_by_url(self, url: Url) -> list[Subscription]:
+        """
+        Find the subscription whose feed URL matches the given URL or, failing that, every subscription whose site
+        URL does (several feeds can belong to the same site).
+        """
+        normalized = normalize_url(url)
+        if (subscription := self.by_feed_url.get(normalized)) is not None:
+            return [subscription]
+        return list(self.by_site_url.get(normalized, []))
+
+    def find_by_url(self, url: Url) -> Subscription | None:
+        """Find the one subscription matching the given URL (or None if none or several match)."""
+        matches = self.find_all_by_url(url)
+        return matches[0] if len(matches) == 1 else None
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+
+def load_subscription_index() -> SubscriptionIndex | None:
+    """Build the index from the locally stored subscriptions (see sync_subscriptions), or None if syncing fails."""
+    result, subscriptions = sync_subscriptions()
+    log.debug(
+        f"{result.value}: {len(subscriptions) if isinstance(subscriptions, list) else subscriptions}"
+    )
+
+    if not isinstance(subscriptions, list):
+        return None
+
+    return SubscriptionIndex.from_subscriptions(subscriptions)
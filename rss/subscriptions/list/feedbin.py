@@ -0,0 +1,132 @@
+"""Feedbin API interactions for listing all RSS feed subscriptions."""
+
+import threading
+import time
+from enum import Enum
+from typing import Any, Literal
+
+from requests import HTTPError
+
+from common.cache import DiskCache
+from rss.domain import Subscription, SubscriptionId
+from rss.utils.feedbin import (
+    API,
+    RequestArgs,
+    cache_key,
+    iter_paginated_request,
+    make_paginated_request,
+    response_cache,
+)
+
+CACHE_TTL = 60 * 60  # 1 hour in seconds
+INDEX_REBUILD_INTERVAL = 24 * 60 * 60  # 1 day in seconds
+
+# Every subscription seen so far (by ID) plus the newest created_at among them, kept between runs
+subscription_index = DiskCache("feedbin-subscription-index")
+SUBSCRIPTION_INDEX_KEY = f"{API}/subscriptions.json#index"
+_subscription_index_lock = threading.Lock()
+
+
+class GetSubscriptionsResult(str, Enum):
+    OK = "✅ Subscriptions found"
+    UNEXPECTED_STATUS_CODE = "🚨 Unexpected status code while listing subscriptions"
+    HTTP_ERROR = "🚨 HTTP error while listing subscriptions"
+    UNEXPECTED_ERROR = "🚨 Unexpected error while listing subscriptions"
+
+
+GetSubscriptionsOutput = (
+    tuple[Literal[GetSubscriptionsResult.OK], list[Subscription]]
+    | tuple[Literal[GetSubscriptionsResult.UNEXPECTED_STATUS_CODE], int]
+    | tuple[Literal[GetSubscriptionsResult.HTTP_ERROR], str]
+    | tuple[Literal[GetSubscriptionsResult.UNEXPECTED_ERROR], str]
+)
+
+
+def get_subscriptions() -> GetSubscriptionsOutput:
+    """
+    Get all RSS feed subscriptions (served from the local cache for up to CACHE_TTL).
+
+    Docs:
+    - https://github.com/feedbin/feedbin-api/blob/master/content/subscriptions.md#get-subscriptions
+    """
+    request_args = RequestArgs(url=f"{API}/subscriptions.json")
+
+    if (cached := response_cache.get(cache_key(request_args))) is not None:
+        return GetSubscriptionsResult.OK, [Subscription(**subscription) for subscription in cached]
+
+    try:
+        all_subscriptions = make_paginated_request(request_args)
+        response_cache.set(cache_key(request_args), all_subscriptions, CACHE_TTL)
+        return GetSubscriptionsResult.OK, [Subscription(**s) for s in all_subscriptions]
+    except HTTPError as e:
+        return GetSubscriptionsResult.HTTP_ERROR, str(e)
+    except Exception as e:
+        return GetSubscriptionsResult.UNEXPECTED_ERROR, str(e)
+
+
+def _save_subscription_index(index: dict[str, Any]) -> None:
+    """Store the index until its next scheduled rebuild."""
+    remaining = INDEX_REBUILD_INTERVAL - (time.time() - index["built_at"])
+    subscription_index.set(SUBSCRIPTION_INDEX_KEY, index, max(remaining, 0))
+
+
+def sync_subscriptions() -> GetSubscriptionsOutput:
+    """
+    Get all RSS feed subscriptions, only asking Feedbin for the ones created since the previous sync.
+
+    The subscriptions seen so far and the newest created_at among them (the high-water mark passed as `since`) are
+    kept in .local_cache/. Subscriptions deleted or renamed by these scripts are updated in place (see
+    forget_subscription and remember_subscription); changes made elsewhere are picked up when the index is rebuilt
+    from scratch every INDEX_REBUILD_INTERVAL.
+
+    Docs:
+    - https://github.com/feedbin/feedbin-api/blob/master/content/subscriptions.md#get-subscriptions
+    """
+    with _subscription_index_lock:
+        index = subscription_index.get(SUBSCRIPTION_INDEX_KEY) or {
+            "built_at": time.time(),
+            "since": None,
+            "subscriptions": {},
+        }
+
+    request_args = RequestArgs(url=f"{API}/subscriptions.json", params={"since": index["since"]})
+
+    try:
+        # JSON object keys are always strings, so subscriptions are stored under str(id)
+        subscriptions: dict[str, dict[str, Any]] = dict(index["subscriptions"])
+        since: str | None = index["since"]
+
+        for page in iter_paginated_request(request_args):
+            for subscription in page:
+                subscriptions[str(subscription["id"])] = subscription
+                created_at = subscription.get("created_at")
+                # ISO 8601 timestamps in the same format and timezone sort lexicographically
+                if created_at and (since is None or created_at > since):
+                    since = created_at
+
+        with _subscription_index_lock:
+            _save_subscription_index({**index, "since": since, "subscriptions": subscriptions})
+
+        return GetSubscriptionsResult.OK, [Subscription(**s) for s in subscriptions.values()]
+    except HTTPError as e:
+        return GetSubscriptionsResult.HTTP_ERROR, str(e)
+    except Exception as e:
+        return GetSubscriptionsResult.UNEXPECTED_ERROR, str(e)
+
+
+def remember_subscription(subscription: dict[str, Any]) -> None:
+    """Replace a subscription's stored details (e.g. after renaming it), if the index has been built."""
+    with _subscription_index_lock:
+        if (index := subscription_index.get(SUBSCRIPTION_INDEX_KEY)) is None:
+            return
+        index["subscriptions"][str(subscription["id"])] = subscription
+        _save_subscription_index(index)
+
+
+def forget_subscription(subscription_id: SubscriptionId) -> None:
+    """Remove a deleted subscription from the stored index, if it's there."""
+    with _subscription_index_lock:
+        if (index := subscription_index.get(SUBSCRIPTION_INDEX_KEY)) is None:
+            return
+        if index["subscriptions"].pop(str(subscription_id), None) is not None:
+            _save_subscription_index(index)
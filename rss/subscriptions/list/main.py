@@ -0,0 +1,17 @@
+"""Entry point for listing all RSS feed subscriptions."""
+
+from common.logs import log
+from rss.subscriptions.list.feedbin import get_subscriptions
+
+
+def main() -> None:
+    log.debug("💪 Getting all subscriptions")
+
+    result, data = get_subscriptions()
+    log.debug(f"{result.value}: {data}")
+
+    log.debug("👍 Done listing subscriptions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import pytest
+
+from rss.domain import Subscription
+from rss.subscriptions.delete.main import resolve_subscription_ids
+from rss.subscriptions.index import SubscriptionIndex, normalize_url
+
+
+def make_subscription(id: int, feed_url: str, site_url: str) -> Subscription:
+    return Subscription(
+        id=id, feed_id=id * 10, title=f"Feed {id}", feed_url=feed_url, site_url=site_url
+    )
+
+
+class TestNormalizeUrl:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://example.com/blog",
+            "http://example.com/blog/",
+            "HTTPS://www.Example.com:443/blog",
+            "example.com/blog",
+            "https://example.com/blog#latest",
+        ],
+    )
+    def test_equivalent_urls_match(_, url: str) -> None:
+        assert normalize_url(url) == "example.com/blog"
+
+    def test_keeps_non_default_ports_and_query_strings(_) -> None:
+        assert (
+            normalize_url("http://example.com:8080/feed?format=rss")
+            == "example.com:8080/feed?format=rss"
+        )
+
+    def test_keeps_path_case(_) -> None:
+        assert normalize_url("https://example.com/Blog") != normalize_url(
+            "https://example.com/blog"
+        )
+
+
+class TestSubscriptionIndex:
+    def test_finds_by_feed_or_site_url(_) -> None:
+        subscription = make_subscription(
+            1, "https://example.com/feed.xml", "https://www.example.com/"
+        )
+        index = SubscriptionIndex.from_subscriptions([subscription])
+
+        assert index.find_by_url("example.com/feed.xml") == subscription
+        assert index.find_by_url("http://example.com") == subscription
+        assert index.find_by_url("https://other.com") is None
+
+    def test_remove_clears_every_lookup(_) -> None:
+        subscription = make_subscription(1, "https://example.com/feed.xml", "https://example.com")
+        index = SubscriptionIndex.from_subscriptions([subscription])
+
+        assert index.remove(1) == subscription
+        assert len(index) == 0
+        assert index.find_by_url("https://example.com") is None
+        assert index.by_feed_id == {}
+
+    def test_remove_keeps_urls_shared_with_other_subscriptions(_) -> None:
+        first = make_subscription(1, "https://example.com/posts.xml", "https://example.com")
+        second = make_subscription(2, "https://example.com/videos.xml", "https://example.com")
+        index = SubscriptionIndex.from_subscriptions([first, second])
+
+        index.remove(1)
+
+        assert index.find_by_url("https://example.com") == second
+        assert index.by_site_url == {"example.com": [second]}
+
+    def test_a_shared_site_url_is_ambiguous(_) -> None:
+        posts = make_subscription(1, "https://example.com/posts.xml", "https://example.com")
+        comments = make_subscription(2, "https://example.com/comments.xml", "https://example.com")
+        index = SubscriptionIndex.from_subscriptions([posts, comments])
+
+        assert index.find_all_by_url("https://example.com") == [posts, comments]
+        assert index.find_by_url("https://example.com") is None
+        assert index.find_by_url("https://example.com/comments.xml") == comments
+
+    def test_add_replaces_the_stored_subscription(_) -> None:
+        index = SubscriptionIndex.from_subscriptions(
+            [make_subscription(1, "https://example.com/feed.xml", "https://example.com")]
+        )
+        renamed = make_subscription(1, "https://example.com/feed.xml", "https://example.com")
+        renamed.title = "Renamed 📖"
+
+        index.add(renamed)
+
+        assert len(index) == 1
+        assert index.by_id[1].title == "Renamed 📖"
+
+
+class TestResolveSubscriptionIds:
+    def test_skips_a_site_url_shared_by_several_subscriptions(_) -> None:
+        index = SubscriptionIndex.from_subscriptions(
+            [
+                make_subscription(1, "https://example.com/posts.xml", "https://example.com"),
+                make_subscription(2, "https://example.com/comments.xml", "https://example.com"),
+                make_subscription(3, "https://other.com/feed.xml", "https://other.com"),
+            ]
+        )
+
+        ids = resolve_subscription_ids(
+            ["https://example.com", "other.com", "example.com/comments.xml", "4"], index
+        )
+
+        assert ids == [3, 2, 4]
@@ -6,7 +6,15 @@ from typing import Literal
 from requests import HTTPError
 
 from rss.domain import Subscription, SubscriptionId, SubscriptionTitleWithSuffix
-from rss.utils.feedbin import API, HTTPMethod, RequestArgs, make_request
+from rss.subscriptions.list.feedbin import remember_subscription
+from rss.utils.feedbin import (
+    API,
+    HTTPMethod,
+    RequestArgs,
+    cache_key,
+    make_request,
+    response_cache,
+)
 
 
 class UpdateSubscriptionResult(str, Enum):
@@ -48,7 +56,13 @@ def update_subscription(
 
         match response.status_code:
             case 200:
-                return UpdateSubscriptionResult.OK, Subscription(**response.json())
+                response_cache.invalidate(
+                    cache_key(request_args),
+                    cache_key(RequestArgs(url=f"{API}/subscriptions.json")),
+                )
+                subscription = response.json()
+                remember_subscription(subscription)
+                return UpdateSubscriptionResult.OK, Subscription(**subscription)
             case _:
                 return UpdateSubscriptionResult.UNEXPECTED_STATUS_CODE, response.status_code
     except HTTPError as e:
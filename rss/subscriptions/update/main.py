@@ -11,6 +11,7 @@ from rss.domain import (
     Url,
 )
 from rss.subscriptions.get.feedbin import get_subscription
+from rss.subscriptions.index import SubscriptionIndex
 from rss.subscriptions.update.feedbin import update_subscription
 
 
@@ -29,15 +30,29 @@ def append_suffix(title: SubscriptionTitle, url: Url) -> SubscriptionTitleWithSu
     return SubscriptionTitleWithSuffix(title=f"{title} {choose_suffix(url)}")
 
 
-def generate_new_title(subscription_id: SubscriptionId) -> SubscriptionTitleWithSuffix | None:
-    """Look up the subscription and generate a new title with the appropriate suffix."""
-    log.debug("🔍 Getting subscription details")
-    get_result, subscription = get_subscription(subscription_id)
-    log.debug(f"{get_result.value}: {subscription}")
+def generate_new_title(
+    subscription_id: SubscriptionId,
+    subscriptions: SubscriptionIndex | None = None,
+) -> SubscriptionTitleWithSuffix | None:
+    """
+    Look up the subscription and generate a new title with the appropriate suffix.
 
-    if not isinstance(subscription, Subscription):
-        log.error(f"Expected Subscription, got {type(subscription)}")
-        return None
+    The subscription is read from the index when it's there, and only fetched from Feedbin otherwise.
+    """
+    subscription: Subscription | None = (
+        subscriptions.by_id.get(subscription_id) if subscriptions is not None else None
+    )
+
+    if subscription is None:
+        log.debug("🔍 Getting subscription details")
+        get_result, data = get_subscription(subscription_id)
+        log.debug(f"{get_result.value}: {data}")
+
+        if not isinstance(data, Subscription):
+            log.error(f"Expected Subscription, got {type(data)}")
+            return None
+
+        subscription = data
 
     log.debug("✍️ Getting updated title")
     return append_suffix(subscription.title, subscription.site_url)
@@ -0,0 +1,269 @@
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+from gspread.exceptions import APIError
+from gspread.worksheet import Worksheet
+from requests import HTTPError
+
+from benchmarks.fake_sheets import FakeWorksheet
+from common.journal import Journal
+from rss import sheets
+from rss.domain import Entry, Subscription, SubscriptionTitleWithSuffix
+from rss.sheets import (
+    ColumnName,
+    EntryIdStream,
+    Row,
+    RunContext,
+    Status,
+    add_title_suffix_and_return_updated_row,
+    parse_rows,
+    process_rows,
+    reconcile_rows,
+    resume_rows,
+    update_row,
+)
+from rss.subscriptions.index import SubscriptionIndex
+from rss.subscriptions.update import main as update_main
+from rss.subscriptions.update.feedbin import UpdateSubscriptionResult
+from rss.utils.sheets import MAX_PENDING_RANGES, SheetWriteBuffer
+
+
+def make_sheet(rows: int, *, done: bool = False, **kwargs: Any) -> FakeWorksheet:
+    """A form responses sheet (columns A to I) with the given number of new or fully processed rows."""
+    return FakeWorksheet.from_records(
+        [
+            {
+                "Timestamp": "1/1/2025 12:00:00",
+                ColumnName.URL: f"https://example-{i}.com/feed",
+                ColumnName.SUBSCRIBED: done,
+                ColumnName.MARKED_UNREAD: done,
+                ColumnName.SUFFIX_ADDED: done,
+                ColumnName.STATUS: Status.SUFFIX_ADDED.value if done else "",
+                ColumnName.SUBSCRIPTION_ID: i + 1 if done else "",
+                ColumnName.FEED_ID: i + 1001 if done else "",
+                ColumnName.DETAILS: "",
+            }
+            for i in range(rows)
+        ],
+        **kwargs,
+    )
+
+
+@pytest.fixture(autouse=True)
+def feedbin_calls(monkeypatch: pytest.MonkeyPatch) -> Counter[str]:
+    """Replace each step's Feedbin calls with their successful outcome (counting the calls made by each step)."""
+    calls: Counter[str] = Counter()
+
+    def subscribe(row: Row, subscriptions: Any = None) -> Row:
+        calls["subscribe"] += 1
+        update = {"status": Status.SUBSCRIBED, "subscribed": True}
+        return row.model_copy(
+            update={**update, "subscription_id": row.index, "feed_id": row.index + 1000}
+        )
+
+    def get_entry_ids(row: Row) -> EntryIdStream:
+        calls["get_entry_ids"] += 1
+        return EntryIdStream(Entry(id=id) for id in (1, 2, 3))
+
+    def mark_unread(row: Row, entry_ids: Iterator[int], already_unread: Any = None) -> Row:
+        calls["mark_unread"] += 1
+        try:
+            list(entry_ids)
+        except Exception as e:
+            return row.model_copy(update={"status": Status.ERROR, "details": str(e)})
+        return row.model_copy(update={"status": Status.MARKED_UNREAD, "marked_unread": True})
+
+    def add_suffix(row: Row, subscriptions: Any = None) -> Row:
+        calls["add_suffix"] += 1
+        return row.model_copy(update={"status": Status.SUFFIX_ADDED, "suffix_added": True})
+
+    monkeypatch.setattr(sheets, "subscribe_and_return_updated_row", subscribe)
+    monkeypatch.setattr(sheets, "get_backlog_entry_ids_or_updated_row", get_entry_ids)
+    monkeypatch.setattr(sheets, "mark_backlog_unread_and_return_updated_row", mark_unread)
+    monkeypatch.setattr(sheets, "add_title_suffix_and_return_updated_row", add_suffix)
+
+    return calls
+
+
+def run(sheet: FakeWorksheet, journal: Journal | None = None) -> list[Row]:
+    """Process the sheet the way main does (resuming from the journal, if given)."""
+    rows = parse_rows(sheet.get_all_records())
+    if journal is not None:
+        rows = resume_rows(rows, journal.records())
+
+    with SheetWriteBuffer(cast(Worksheet, sheet)) as writes:
+        rows = reconcile_rows(rows, writes)
+        return process_rows(rows, writes, RunContext(journal=journal))
+
+
+class TestSheetsCallsPerRun:
+    @pytest.mark.parametrize("rows", [1, 10, 120])
+    def test_one_read_and_one_batched_write_per_max_pending_rows(_, rows: int) -> None:
+        sheet = make_sheet(rows)
+
+        run(sheet)
+
+        assert sheet.stats.read_requests == 1
+        assert sheet.stats.calls.get("update", 0) == 0
+        assert sheet.stats.write_requests == -(-rows // MAX_PENDING_RANGES)
+        # Columns C to I of every row (a row still being processed when a batch is sent is written again later)
+        assert sheet.stats.cells_written >= rows * 7
+
+    def test_unchanged_rows_are_not_written(_) -> None:
+        sheet = make_sheet(20, done=True)
+
+        run(sheet)
+
+        assert sheet.stats.write_requests == 0
+
+    def test_written_rows_read_back_as_processed(_) -> None:
+        sheet = make_sheet(3)
+
+        updated_rows = run(sheet)
+        reread_rows = parse_rows(sheet.get_all_records())
+
+        assert [r.model_dump() for r in reread_rows] == [r.model_dump() for r in updated_rows]
+        assert all(r.status == Status.SUFFIX_ADDED for r in reread_rows)
+
+
+class TestBacklogErrors:
+    def test_a_failed_later_page_stops_the_row_before_the_suffix_step(
+        _, monkeypatch: pytest.MonkeyPatch, feedbin_calls: Counter[str]
+    ) -> None:
+        def entries() -> Iterator[Entry]:
+            yield Entry(id=1)
+            raise HTTPError("500 Server Error")
+
+        monkeypatch.setattr(
+            sheets, "get_backlog_entry_ids_or_updated_row", lambda row: EntryIdStream(entries())
+        )
+
+        (row,) = run(make_sheet(1))
+
+        assert feedbin_calls["add_suffix"] == 0
+        assert row.status == Status.SUBSCRIBED
+        assert row.marked_unread is False
+        assert row.details.endswith("500 Server Error")
+
+
+class TestAddTitleSuffix:
+    def test_titles_are_read_from_the_index_without_fetching_each_subscription(
+        _, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        rows = parse_rows(make_sheet(5, done=True).get_all_records())
+        subscriptions = SubscriptionIndex.from_subscriptions(
+            [
+                Subscription(
+                    id=i + 1,
+                    feed_id=i + 1001,
+                    title=f"Feed {i + 1}",
+                    feed_url=f"https://example-{i}.com/feed",
+                    site_url=f"https://example-{i}.com",
+                )
+                for i in range(5)
+            ]
+        )
+        fetched: list[int] = []
+        renamed: dict[int, str] = {}
+
+        def update(
+            subscription_id: int, new_title: SubscriptionTitleWithSuffix
+        ) -> tuple[UpdateSubscriptionResult, Subscription]:
+            renamed[subscription_id] = new_title.title
+            subscription = subscriptions.by_id[subscription_id].model_copy(
+                update={"title": new_title.title}
+            )
+            return UpdateSubscriptionResult.OK, subscription
+
+        monkeypatch.setattr(update_main, "get_subscription", fetched.append)
+        monkeypatch.setattr(sheets, "update_subscription", update)
+
+        for row in rows:
+            add_title_suffix_and_return_updated_row(row, subscriptions)
+
+        assert fetched == []
+        assert renamed == {id: f"Feed {id} 📖" for id in range(1, 6)}
+        assert all(subscriptions.by_id[id].title.endswith(" 📖") for id in renamed)
+
+
+class TestUpdateRow:
+    def test_reverting_a_flushed_value_writes_the_original_back(_) -> None:
+        sheet = make_sheet(1)
+        (original,) = parse_rows(sheet.get_all_records())
+        changed = original.model_copy(update={"status": Status.ERROR, "details": "Oops"})
+
+        with SheetWriteBuffer(cast(Worksheet, sheet)) as writes:
+            row = update_row(row=changed, row_index=2, writes=writes)
+            writes.flush()  # e.g. by the timer
+            reverted = row.model_copy(update={"status": original.status, "details": ""})
+            update_row(row=reverted, row_index=2, writes=writes)
+
+        (reread,) = parse_rows(sheet.get_all_records())
+        assert reread.status == original.status
+        assert sheet.stats.write_requests == 2
+
+    def test_unchanged_rows_are_skipped(_) -> None:
+        sheet = make_sheet(1)
+        (row,) = parse_rows(sheet.get_all_records())
+
+        with SheetWriteBuffer(cast(Worksheet, sheet)) as writes:
+            assert update_row(row=row, row_index=2, writes=writes) is row
+
+        assert sheet.stats.write_requests == 0
+
+
+class TestQuotas:
+    def test_requests_over_the_per_minute_quota_are_rejected_with_429(_) -> None:
+        now = 0.0
+        sheet = FakeWorksheet([["A"]], write_quota=2, clock=lambda: now)
+
+        sheet.update([["1"]], "A2")
+        sheet.update([["2"]], "A3")
+        with pytest.raises(APIError) as error:
+            sheet.update([["3"]], "A4")
+
+        assert error.value.code == 429
+        assert sheet.stats.throttled_requests == 1
+
+        now = 61.0
+        sheet.update([["3"]], "A4")
+        assert sheet.stats.write_requests == 3
+
+
+class TestResume:
+    def test_rerun_after_a_failed_write_picks_up_where_the_last_run_stopped(
+        _, tmp_path: Path, feedbin_calls: Counter[str]
+    ) -> None:
+        journal = Journal("sheets-journal", cache_dir=str(tmp_path))
+        sheet = make_sheet(60, write_quota=0)  # the first flush (after 50 rows) fails with a 429
+
+        with pytest.raises(APIError):
+            run(sheet, journal)
+
+        assert feedbin_calls["subscribe"] == 50
+
+        rerun_sheet = FakeWorksheet(sheet.values)  # nothing was written, and the quota has reset
+        run(rerun_sheet, journal)
+
+        # Every stage ran once per row across both runs
+        assert feedbin_calls == {
+            "subscribe": 60,
+            "get_entry_ids": 60,
+            "mark_unread": 60,
+            "add_suffix": 60,
+        }
+        # One write to catch up on the first run, and one for the rows it didn't get to
+        assert rerun_sheet.stats.write_requests == 2
+        assert all(
+            r.status == Status.SUFFIX_ADDED for r in parse_rows(rerun_sheet.get_all_records())
+        )
+
+    def test_journal_records_for_a_changed_url_are_ignored(_, tmp_path: Path) -> None:
+        journal = Journal("sheets-journal", cache_dir=str(tmp_path))
+        (row,) = parse_rows(make_sheet(1).get_all_records())
+        journal.append({**sheets.journal_record(row), "url": "https://elsewhere.com/feed"})
+
+        assert resume_rows([row], journal.records()) == [row]
@@ -2,25 +2,87 @@
 Common functionality used by the Feedbin API endpoint adapters.
 """
 
-from dataclasses import dataclass
+import asyncio
+import atexit
+import os
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from enum import Enum
+from itertools import count, islice, takewhile
 from typing import Any
+from urllib.parse import urlencode, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 
-from common.secrets import get_secret
+from common.cache import DiskCache
+from common.logs import log, log_fields
+from common.secrets import get_secret, load_secrets
+from rss.utils.metrics import RequestMetrics, RequestRecord
+from rss.utils.rate_limit import (
+    MAX_RETRIES,
+    AdaptiveRateLimiter,
+    backoff_delay,
+    parse_retry_after,
+)
 
-API = "https://api.feedbin.com/v2"
+# Set FEEDBIN_API to point every request at another server (e.g. benchmarks/fake_feedbin.py)
+API = os.getenv("FEEDBIN_API", "https://api.feedbin.com/v2")
 
+# Connection pool defaults (see: https://requests.readthedocs.io/en/latest/user/advanced/#session-objects)
+POOL_CONNECTIONS = 1  # number of hosts to keep a pool for (we only talk to api.feedbin.com)
+POOL_MAXSIZE = 10  # max keep-alive connections kept open per host
+POOL_BLOCK = False  # if True, wait for a free connection instead of opening a throwaway one
+
+# Cap on in-flight calls when fanning out with the async helpers below. Calls from every stage, thread and page
+# read-ahead share the pool, so make_request also holds one of POOL_MAXSIZE connection slots while each request is
+# in flight; extra requests wait for a free slot instead of opening throwaway connections.
+MAX_CONCURRENT_REQUESTS = 8
+
+# Every request (from any adapter or thread) waits for this limiter, so throttling slows everyone down together
+rate_limiter = AdaptiveRateLimiter()
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Repeating these after the server may have acted on them could create duplicates (e.g. two subscriptions), so
+# they're only retried when the server asked for it or the request never left
+NON_IDEMPOTENT_METHODS = frozenset({"POST"})
+
+# Read-only responses are cached on disk between runs (see common/cache.py and each adapter's CACHE_TTL)
+response_cache = DiskCache("feedbin")
+
+# ETag/Last-Modified validators (plus the body they validate) for the list endpoints below, so unchanged pages can
+# be revalidated with a conditional request instead of downloaded again
+validator_cache = DiskCache("feedbin-validators", max_size=20 * 1024 * 1024)
+REVALIDATED_ENDPOINTS = frozenset({"/v2/feeds/:id/entries.json", "/v2/subscriptions.json"})
+MAX_STORED_BODY = 512 * 1024  # bigger bodies are downloaded again rather than crowding out the rest
+REVALIDATED_HEADER = "X-Revalidated-From-Cache"  # added to responses rebuilt from validator_cache
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "links")
+
+# How many pages of a paginated request to fetch in the background while the current page is being processed
+PAGINATION_READ_AHEAD = 3
+
+
+SECRETS = (("Feedbin", "username"), ("Feedbin", "password"))
 
 _auth = None
 
+# Called with a RequestRecord after every request (including its retries) finishes, e.g. to collect metrics
+RequestHook = Callable[[RequestRecord], None]
+request_metrics = RequestMetrics()
+request_hooks: list[RequestHook] = [request_metrics]
+
 
 def _get_auth() -> tuple[str, str]:
     "Retrieve the username and password for the Feedbin API from 1Password."
     global _auth
 
     if _auth is None:
+        load_secrets(SECRETS)
         username = get_secret("Feedbin", "username")
         password = get_secret("Feedbin", "password")
         _auth = (username, password)
@@ -28,6 +90,74 @@ def _get_auth() -> tuple[str, str]:
     return _auth
 
 
+@dataclass(frozen=True)
+class PoolConfig:
+    connections: int = POOL_CONNECTIONS
+    maxsize: int = POOL_MAXSIZE
+    block: bool = POOL_BLOCK
+    keep_alive: bool = True
+
+
+_pool_config = PoolConfig()
+_connection_slots = threading.BoundedSemaphore(_pool_config.maxsize)
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def configure_session(config: PoolConfig) -> None:
+    """
+    Replace the pool settings used by the shared session.
+
+    Any existing session is closed so the next request picks up the new settings.
+    """
+    global _pool_config, _connection_slots
+
+    close_session()
+    _pool_config = config
+    _connection_slots = threading.BoundedSemaphore(config.maxsize)
+
+
+def get_session() -> requests.Session:
+    """
+    Create and cache a session that reuses TCP + TLS connections to the Feedbin API across requests.
+    """
+    global _session
+
+    if _session is not None:
+        return _session
+
+    with _session_lock:
+        if _session is not None:
+            return _session
+
+        adapter = HTTPAdapter(
+            pool_connections=_pool_config.connections,
+            pool_maxsize=_pool_config.maxsize,
+            pool_block=_pool_config.block,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive" if _pool_config.keep_alive else "close"
+        session.auth = _get_auth()
+        _session = session
+
+        return _session
+
+
+def close_session() -> None:
+    """Close the shared session (and every pooled connection it holds open)."""
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+atexit.register(close_session)
+
+
 class HTTPMethod(str, Enum):
     GET = "GET"
     PATCH = "PATCH"
@@ -42,6 +172,103 @@ class RequestArgs:
     json: dict[str, Any] | None = None
 
 
+def cache_key(args: RequestArgs) -> str:
+    """Identify a GET request's response by its URL and (non-empty) query params."""
+    params = {k: v for k, v in (args.params or {}).items() if v is not None}
+    return f"{args.url}?{urlencode(sorted(params.items()))}" if params else args.url
+
+
+def stored_response(args: RequestArgs) -> requests.Response | None:
+    """Rebuild the last 200 response to a GET request from validator_cache (without making a request)."""
+    stored = validator_cache.get(cache_key(args))
+    if stored is None:
+        return None
+
+    response = requests.Response()
+    response.status_code = 200
+    response.url = args.url
+    response.encoding = "utf-8"
+    response._content = stored["body"].encode()
+    response.headers.update(stored["headers"])
+    response.headers[REVALIDATED_HEADER] = "true"
+    return response
+
+
+def is_revalidated(response: requests.Response) -> bool:
+    """Whether the response is a stored body that Feedbin just confirmed is unchanged (HTTP 304)."""
+    return response.headers.get(REVALIDATED_HEADER) == "true"
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Group requests to the same endpoint by replacing the IDs in a URL's path with ":id".
+
+    Example:
+     - "https://api.feedbin.com/v2/feeds/123/entries.json?page=2" -> "/v2/feeds/:id/entries.json"
+    """
+    return re.sub(r"/\d+(?=/|\.json|$)", "/:id", urlsplit(url).path)
+
+
+def is_revalidated_endpoint(method: HTTPMethod, args: RequestArgs) -> bool:
+    """Whether responses to the request are stored in validator_cache (see REVALIDATED_ENDPOINTS)."""
+    return method == HTTPMethod.GET and endpoint_name(args.url) in REVALIDATED_ENDPOINTS
+
+
+def _never_sent(error: requests.RequestException) -> bool:
+    """Whether a request failed before any of it could reach the server (so retrying it can't repeat it)."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _should_retry(method: HTTPMethod, response: requests.Response) -> bool:
+    """Whether a failed (RETRY_STATUS_CODES) response is safe to retry."""
+    if method.value not in NON_IDEMPOTENT_METHODS:
+        return True
+    # A throttled request wasn't processed, and Retry-After says when to send it again
+    return response.status_code == 429 and "Retry-After" in response.headers
+
+
+def _run_request_hooks(
+    method: HTTPMethod,
+    args: RequestArgs,
+    response: requests.Response | None,
+    started_at: float,
+    attempts: int,
+) -> None:
+    """Log a finished request and pass its RequestRecord to every request hook."""
+    record = RequestRecord(
+        method=method.value,
+        endpoint=endpoint_name(args.url),
+        status_code=response.status_code if response is not None else 0,
+        bytes=len(response.content) if response is not None else 0,
+        duration=round((time.perf_counter() - started_at) * 1_000_000),
+        attempts=attempts,
+    )
+
+    log.debug(
+        "🌐 %s %s → %s (%.0f ms)",
+        method.value,
+        args.url,
+        record.status_code,
+        record.duration / 1000,
+        extra=log_fields(
+            endpoint=record.endpoint,
+            method=record.method,
+            status_code=record.status_code,
+            duration_ms=round(record.duration / 1000, 1),
+            attempts=attempts,
+        ),
+    )
+
+    for hook in request_hooks:
+        try:
+            hook(record)
+        except Exception:
+            log.error(f"🚨 Request hook {hook!r} failed", exc_info=True)
+
+
 def make_request(method: HTTPMethod, args: RequestArgs) -> requests.Response:
     """
     Make an HTTP request to the Feedbin API.
@@ -49,6 +276,19 @@ def make_request(method: HTTPMethod, args: RequestArgs) -> requests.Response:
     Since the possible status codes (and their explanations) vary by endpoint, we raise them at this base level
     and catch them one level up in the endpoint-specific API helper functions.
 
+    Every request first waits for the shared rate_limiter and a free pooled connection. Throttled (429), failed
+    (5xx) and dropped requests are retried up to MAX_RETRIES times with jittered exponential backoff (or after the
+    server's Retry-After), and a 429 also slows down the limiter for every other caller. POSTs are only retried after
+    a 429 with a Retry-After or when the connection couldn't be opened, since the server may already have acted on
+    them otherwise.
+
+    GETs to REVALIDATED_ENDPOINTS are conditional whenever validators for the same URL and params are stored: a 304
+    is returned as the stored 200 response (see is_revalidated), and new 200 responses with validators are stored
+    (unless their body is bigger than MAX_STORED_BODY).
+
+    Docs:
+     - https://github.com/feedbin/feedbin-api?tab=readme-ov-file#caching
+
     TODO:
      - Expect different request args for GET vs POST methods?
     """
@@ -57,16 +297,71 @@ def make_request(method: HTTPMethod, args: RequestArgs) -> requests.Response:
     if method in (HTTPMethod.PATCH, HTTPMethod.POST):
         headers["Content-Type"] = "application/json; charset=utf-8"
 
-    response = requests.request(
-        method.value,
-        args.url,
-        json=args.json,
-        params=args.params,
-        headers=headers,
-        auth=_get_auth(),
-    )
+    stored = stored_response(args) if is_revalidated_endpoint(method, args) else None
+    if stored is not None:
+        if etag := stored.headers.get("ETag"):
+            headers["If-None-Match"] = etag
+        if last_modified := stored.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = last_modified
+
+    started_at = time.perf_counter()
+
+    for attempt in count():
+        rate_limiter.acquire()
+
+        try:
+            with _connection_slots:  # never more requests in flight than pooled connections
+                response = get_session().request(
+                    method.value,
+                    args.url,
+                    json=args.json,
+                    params=args.params,
+                    headers=headers,
+                )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            retryable = method.value not in NON_IDEMPOTENT_METHODS or _never_sent(e)
+            if attempt >= MAX_RETRIES or not retryable:
+                _run_request_hooks(method, args, None, started_at, attempt + 1)
+                raise
+            delay = backoff_delay(attempt)
+            log.warning(f"🔁 {method.value} {args.url} failed to connect; retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        if response.status_code not in RETRY_STATUS_CODES:
+            break
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if response.status_code == 429:
+            rate_limiter.on_throttled(retry_after)
+
+        if attempt >= MAX_RETRIES or not _should_retry(method, response):
+            break
+
+        delay = backoff_delay(attempt, retry_after)
+        log.warning(
+            f"🔁 {method.value} {args.url} returned {response.status_code}; retrying in {delay:.1f}s"
+        )
+        time.sleep(delay)
+
+    if response.status_code not in RETRY_STATUS_CODES:
+        rate_limiter.on_success()
+
+    _run_request_hooks(method, args, response, started_at, attempt + 1)
+
     response.raise_for_status()
 
+    if stored is not None and response.status_code == 304:
+        return stored
+
+    if is_revalidated_endpoint(method, args) and response.status_code == 200:
+        has_validators = "ETag" in response.headers or "Last-Modified" in response.headers
+        if has_validators and len(response.content) <= MAX_STORED_BODY:
+            stored_headers = {
+                k: response.headers[k] for k in STORED_HEADERS if k in response.headers
+            }
+            validator_cache.set(cache_key(args), {"headers": stored_headers, "body": response.text})
+
     return response
 
 
@@ -89,22 +384,165 @@ def parse_link_header(link_header: str) -> dict[str, str]:
     return links
 
 
-def make_paginated_request(request_args: RequestArgs) -> list[dict[str, Any]]:
+Page = list[dict[str, Any]]
+
+
+_PAGE_NUMBER = re.compile(r"([?&]page=)(\d+)")
+
+
+def _get_links(response: requests.Response) -> dict[str, str]:
+    link_header = response.headers.get("links")
+    return parse_link_header(link_header) if link_header else {}
+
+
+def _predict_page_urls(links: dict[str, str]) -> Iterator[str] | None:
+    """
+    Predict the URLs of the upcoming pages by counting up from the "next" link's ?page=N (stopping at the "last"
+    link's page number, if there is one). Returns None if the "next" link doesn't follow that pattern.
+    """
+    next_match = _PAGE_NUMBER.search(links.get("next", ""))
+    if next_match is None:
+        return None
+
+    last_match = _PAGE_NUMBER.search(links.get("last", ""))
+    last_page = int(last_match.group(2)) if last_match else None
+
+    def page_url(page: int) -> str:
+        return _PAGE_NUMBER.sub(lambda m: f"{m.group(1)}{page}", links["next"], count=1)
+
+    pages = count(int(next_match.group(2)))
+    return map(page_url, pages if last_page is None else takewhile(lambda p: p <= last_page, pages))
+
+
+def iter_paginated_request(
+    request_args: RequestArgs,
+    *,
+    read_ahead: int = PAGINATION_READ_AHEAD,
+) -> Iterator[Page]:
+    """
+    Yield each page of results for a paginated request as soon as it arrives.
+
+    While a page is being processed, up to read_ahead of the following pages are already being fetched in the
+    background. When the "next" link follows the ?page=N pattern, several upcoming pages are requested at once;
+    otherwise, the next page is requested as soon as its link is known. The walk stops at the first page that is
+    short, empty or has no "next" link (any pages requested past that point are discarded).
+
+    If Feedbin says the first page hasn't changed since it was stored (HTTP 304), the later pages stored with it are
+    replayed without any more requests, since new entries would have shown up on the first page.
+
+    Nothing is requested until the first page is asked for, and the caller's request args are left untouched.
+
+    Docs:
+     - https://github.com/feedbin/feedbin-api?tab=readme-ov-file#pagination
+    """
+
+    def fetch(url: str) -> requests.Response:
+        return make_request(HTTPMethod.GET, replace(request_args, url=url))
+
+    if not request_args.url:
+        return
+
+    response = fetch(request_args.url)
+    revalidated = is_revalidated(response)
+
+    if read_ahead < 1 or revalidated:
+        while True:
+            yield response.json()
+
+            next_url = _get_links(response).get("next", "")
+            if not next_url:
+                return
+
+            stored = stored_response(replace(request_args, url=next_url)) if revalidated else None
+            response = stored if stored is not None else fetch(next_url)
+
+    with ThreadPoolExecutor(max_workers=read_ahead, thread_name_prefix="feedbin-page") as executor:
+        first_page: Page = response.json()
+        links = _get_links(response)
+        predicted_urls = _predict_page_urls(links)
+
+        if predicted_urls is None:
+            # Can't guess the upcoming URLs, so stay one page ahead by following each "next" link right away
+            page = first_page
+            while True:
+                next_url = links.get("next", "")
+                upcoming = executor.submit(fetch, next_url) if next_url else None
+                yield page
+                if upcoming is None:
+                    return
+                response = upcoming.result()
+                page = response.json()
+                links = _get_links(response)
+
+        pending: deque[Future[requests.Response]] = deque(
+            executor.submit(fetch, url) for url in islice(predicted_urls, read_ahead)
+        )
+        yield first_page
+
+        while pending:
+            response = pending.popleft().result()
+            page = response.json()
+
+            if page:
+                yield page
+
+            if len(page) < len(first_page) or "next" not in _get_links(response):
+                break
+
+            if (upcoming_url := next(predicted_urls, None)) is not None:
+                pending.append(executor.submit(fetch, upcoming_url))
+
+        for overshoot in pending:
+            overshoot.cancel()
+
+
+def make_paginated_request(request_args: RequestArgs) -> Page:
     """
     Fetch all pages of results for a paginated request.
 
     Docs:
      - https://github.com/feedbin/feedbin-api?tab=readme-ov-file#pagination
     """
-    all_results = []
-    while request_args.url:
-        response = make_request(HTTPMethod.GET, request_args)
-        all_results.extend(response.json())
-        link_header = response.headers.get("links")
-        if link_header:
-            links = parse_link_header(link_header)
-            request_args.url = links.get("next", "")
-        else:
-            request_args.url = ""
-
-    return all_results
+    return [result for page in iter_paginated_request(request_args) for result in page]
+
+
+async def call_async[**P, T](
+    semaphore: asyncio.Semaphore,
+    fn: Callable[P, T],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> T:
+    """
+    Run a blocking Feedbin call (e.g. an endpoint adapter) in a worker thread once the semaphore has a free slot.
+
+    Since the adapters only return their usual tagged (Result, data) tuples, awaiting this gives back exactly what
+    calling the adapter directly would have.
+    """
+    async with semaphore:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+async def gather_calls[A, T](
+    fn: Callable[[A], T],
+    inputs: Iterable[A],
+    *,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+) -> list[T]:
+    """
+    Call fn once per input with at most max_concurrency calls in flight, returning the outputs in input order.
+
+    Example:
+     - await gather_calls(create_subscription, urls, max_concurrency=4)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    return await asyncio.gather(*(call_async(semaphore, fn, item) for item in inputs))
+
+
+def run_concurrently[A, T](
+    fn: Callable[[A], T],
+    inputs: Iterable[A],
+    *,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+) -> list[T]:
+    """Synchronous entry point for gather_calls (for callers that aren't already inside an event loop)."""
+    return asyncio.run(gather_calls(fn, inputs, max_concurrency=max_concurrency))
@@ -0,0 +1,185 @@
+"""
+Per-endpoint request metrics for the Feedbin API (see the request hooks in rss/utils/feedbin.py).
+
+Latencies are recorded in HDR-style histograms: values are grouped into buckets whose width grows with the value,
+so every recorded latency (from a microsecond to several minutes) is kept to within 1% (1/128 of its value) while
+counting only the buckets in use, and percentiles can be read back without storing every sample.
+
+Docs:
+ - https://hdrhistogram.github.io/HdrHistogram/
+ - https://rich.readthedocs.io/en/stable/tables.html
+"""
+
+import json
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from rich.table import Table
+
+Microseconds = int
+Milliseconds = float
+
+# 2**8 = 256 sub-buckets per power of two, so bucket widths stay within 1/128 (0.78%) of their values
+SUB_BUCKET_BITS = 8
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT // 2
+
+
+@dataclass
+class LatencyHistogram:
+    """A log-linear histogram of latencies with bounded relative error."""
+
+    counts: Counter[int] = field(default_factory=Counter)
+    count: int = 0
+    total: Microseconds = 0
+    min: Microseconds | None = None
+    max: Microseconds | None = None
+
+    @staticmethod
+    def _bucket(value: Microseconds) -> int:
+        """Values below SUB_BUCKET_COUNT get a bucket each; above that, each power of two gets SUB_BUCKET_HALF."""
+        if value < SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (value >> shift) - SUB_BUCKET_HALF
+
+    @staticmethod
+    def _highest_in_bucket(bucket: int) -> Microseconds:
+        if bucket < SUB_BUCKET_COUNT:
+            return bucket
+        shift, offset = divmod(bucket - SUB_BUCKET_COUNT, SUB_BUCKET_HALF)
+        shift += 1
+        return ((offset + SUB_BUCKET_HALF + 1) << shift) - 1
+
+    def record(self, value: Microseconds) -> None:
+        value = max(0, value)
+        self.counts[self._bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent: float) -> Microseconds:
+        """The latency that percent% of recorded values are at or below (to within one bucket)."""
+        if self.count == 0:
+            return 0
+
+        target = max(1, round(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self._highest_in_bucket(bucket), self.max or 0)
+
+        return self.max or 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass(frozen=True)
+class RequestRecord:
+    """One finished request (including any retries), as passed to each request hook."""
+
+    method: str
+    endpoint: str
+    status_code: int  # 0 when the request never got a response
+    bytes: int
+    duration: Microseconds
+    attempts: int
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    bytes: int = 0
+    status_codes: Counter[int] = field(default_factory=Counter)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+def _ms(value: Microseconds) -> Milliseconds:
+    return round(value / 1000, 1)
+
+
+class RequestMetrics:
+    """
+    Collect request counts, status codes, response sizes and latency histograms per endpoint.
+
+    Instances are callable, so one can be registered directly as a request hook.
+    """
+
+    def __init__(self) -> None:
+        self._endpoints: dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record: RequestRecord) -> None:
+        self.record(record)
+
+    def record(self, record: RequestRecord) -> None:
+        key = f"{record.method} {record.endpoint}"
+        with self._lock:
+            stats = self._endpoints.setdefault(key, EndpointStats())
+            stats.requests += 1
+            stats.bytes += record.bytes
+            stats.status_codes[record.status_code] += 1
+            stats.latency.record(record.duration)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Every endpoint's stats as plain JSON-serializable values (latencies in milliseconds)."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": stats.requests,
+                    "bytes": stats.bytes,
+                    "status_codes": {
+                        str(code): n for code, n in sorted(stats.status_codes.items())
+                    },
+                    "latency_ms": {
+                        "min": _ms(stats.latency.min or 0),
+                        "mean": _ms(round(stats.latency.mean)),
+                        "p50": _ms(stats.latency.percentile(50)),
+                        "p95": _ms(stats.latency.percentile(95)),
+                        "p99": _ms(stats.latency.percentile(99)),
+                        "max": _ms(stats.latency.max or 0),
+                    },
+                }
+                for endpoint, stats in sorted(self._endpoints.items())
+            }
+
+    def export_json(self, path: str | Path) -> None:
+        """Write the summary to a JSON file (e.g. to compare runs)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.summary(), indent=2))
+
+    def summary_table(self, title: str = "Feedbin requests (latency in ms):") -> Table:
+        table = Table(title=title, show_header=True, title_justify="left", title_style="bold cyan")
+        table.add_column(header="Endpoint", style="yellow", no_wrap=True)
+        table.add_column(header="Reqs", style="magenta", justify="right", no_wrap=True)
+        table.add_column(header="Statuses", style="cyan", no_wrap=True)
+        table.add_column(header="KB", style="white", justify="right", no_wrap=True)
+        table.add_column(header="p50", style="green", justify="right", no_wrap=True)
+        table.add_column(header="p95", style="yellow", justify="right", no_wrap=True)
+        table.add_column(header="p99", style="red", justify="right", no_wrap=True)
+
+        for endpoint, stats in self.summary().items():
+            latency = stats["latency_ms"]
+            table.add_row(
+                endpoint,
+                str(stats["requests"]),
+                ", ".join(f"{code}×{n}" for code, n in stats["status_codes"].items()),
+                f"{stats['bytes'] / 1024:.1f}",
+                f"{latency['p50']:.0f}",
+                f"{latency['p95']:.0f}",
+                f"{latency['p99']:.0f}",
+            )
+
+        return table
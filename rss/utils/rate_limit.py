@@ -0,0 +1,134 @@
+"""
+Rate limiting and retry scheduling shared by every Feedbin request (see make_request).
+
+Docs:
+ - https://en.wikipedia.org/wiki/Token_bucket
+ - https://en.wikipedia.org/wiki/Additive_increase/multiplicative_decrease
+ - https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+ - https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Retry-After
+"""
+
+import random
+import threading
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+Seconds = float
+RequestsPerSecond = float
+
+INITIAL_RATE = 10.0
+MIN_RATE = 0.5
+MAX_RATE = 20.0
+BURST = 10  # requests that may be sent back to back after a quiet period
+RATE_INCREASE = 1.0  # requests/second added back for each second of successful requests
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_CAP = 30.0  # seconds
+
+
+class AdaptiveRateLimiter:
+    """
+    A thread-safe token bucket whose refill rate adapts to how the server responds.
+
+    Every throttled response (HTTP 429) halves the rate and pauses all callers until the server's Retry-After has
+    passed; successful responses add the rate back linearly, at RATE_INCREASE requests/second per second, up to
+    max_rate (AIMD). The increase depends on time rather than on the number of requests, so a higher rate doesn't
+    climb back any faster, and it takes a while to approach the rate that was last throttled again. Callers that
+    share one limiter therefore settle just below the rate the server tolerates instead of retrying in bursts.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: RequestsPerSecond = INITIAL_RATE,
+        min_rate: RequestsPerSecond = MIN_RATE,
+        max_rate: RequestsPerSecond = MAX_RATE,
+        burst: int = BURST,
+    ) -> None:
+        self._rate = rate
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._increased_at = self._updated_at
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> RequestsPerSecond:
+        return self._rate
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = max(self._paused_until - now, (1 - self._tokens) / self._rate)
+
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """Add back RATE_INCREASE per second since the rate last changed (at most a second's worth per request)."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = min(1.0, max(0.0, now - self._increased_at))  # a quiet period isn't a success
+            self._rate = min(self._max_rate, self._rate + RATE_INCREASE * elapsed)
+            self._increased_at = max(self._increased_at, now)
+
+    def on_throttled(self, retry_after: Seconds | None = None) -> None:
+        """Halve the rate after a 429 and hold every caller back until Retry-After has passed."""
+        with self._lock:
+            now = time.monotonic()
+            self._rate = max(self._min_rate, self._rate / 2)
+            self._tokens = 0
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            self._increased_at = max(now, self._paused_until)  # recover only once the pause is over
+
+
+def parse_retry_after(value: str | None) -> Seconds | None:
+    """Parse a Retry-After header given either as a number of seconds or as an HTTP date."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    # HTTP dates are always in GMT, but one sent without a zone (or with "-0000") parses as naive
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after: Seconds | None = None) -> Seconds:
+    """
+    How long to wait before retry number `attempt` (starting at 0).
+
+    Honors the server's Retry-After when given; otherwise uses "full jitter" exponential backoff, so concurrent
+    callers that failed together don't all retry at the same moment.
+    """
+    if retry_after is not None:
+        return retry_after
+
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
@@ -0,0 +1,112 @@
+"""
+Common functionality used when writing to Google Sheets.
+
+Docs:
+ - https://docs.gspread.org/en/latest/api/models/worksheet.html#gspread.worksheet.Worksheet.batch_update
+ - https://developers.google.com/sheets/api/limits
+"""
+
+import atexit
+import threading
+from types import TracebackType
+from typing import Any, Self
+
+from gspread.worksheet import Worksheet
+
+from common.logs import log
+
+MAX_PENDING_RANGES = 50  # flush as soon as this many ranges are waiting to be written
+MAX_RANGES_PER_BATCH = 100  # split bigger flushes into several batch_update calls
+FLUSH_INTERVAL_SECONDS = 10.0  # flush whatever is waiting at least this often
+
+A1Range = str
+CellValues = list[list[Any]]
+
+
+class SheetWriteBuffer:
+    """
+    Collect pending writes to a worksheet and send them with as few batch_update calls as possible.
+
+    Writes to the same range replace each other, so only the latest values for each range are sent. Pending writes
+    are flushed when MAX_PENDING_RANGES are waiting, every FLUSH_INTERVAL_SECONDS, and on close (including at exit),
+    so partial progress survives a crash between flushes.
+    """
+
+    def __init__(
+        self,
+        sheet: Worksheet,
+        *,
+        max_pending: int = MAX_PENDING_RANGES,
+        max_per_batch: int = MAX_RANGES_PER_BATCH,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self._sheet = sheet
+        self._max_pending = max_pending
+        self._max_per_batch = max_per_batch
+        self._flush_interval = flush_interval
+        self._pending: dict[A1Range, CellValues] = {}
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._timer.start()
+        atexit.register(self.close)
+
+    def write(self, range_name: A1Range, values: CellValues) -> None:
+        """Queue values to be written to a range, flushing right away if enough writes are waiting."""
+        with self._lock:
+            self._pending[range_name] = values
+            if len(self._pending) >= self._max_pending:
+                self.flush()
+
+    def write_many(self, updates: dict[A1Range, CellValues]) -> None:
+        """Queue values for several ranges and send them all in one flush (instead of every max_pending writes)."""
+        with self._lock:
+            self._pending.update(updates)
+            self.flush()
+
+    def flush(self) -> None:
+        """Send every pending write to the sheet in chunks of at most max_per_batch ranges."""
+        with self._lock:
+            while self._pending:
+                ranges = list(self._pending)[: self._max_per_batch]
+                data = [{"range": r, "values": self._pending[r]} for r in ranges]
+
+                log.debug(f"📝 Writing {len(data)} ranges to the sheet")
+                self._sheet.batch_update(data)
+
+                for r in ranges:
+                    del self._pending[r]
+
+    def close(self) -> None:
+        """Stop the flush timer and write anything still pending."""
+        atexit.unregister(self.close)
+        self._closed.set()
+        self.flush()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                log.error("🚨 Failed to flush pending sheet writes (will retry)")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc is None:
+            self.close()
+            return
+
+        # Don't let a failed final flush hide the error that's already on its way out
+        try:
+            self.close()
+        except Exception:
+            log.error(
+                "🚨 Failed to flush pending sheet writes after an earlier error", exc_info=True
+            )
@@ -0,0 +1,135 @@
+import json
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from common.cache import DiskCache
+from rss.utils import feedbin
+from rss.utils.feedbin import (
+    HTTPMethod,
+    RequestArgs,
+    cache_key,
+    is_revalidated,
+    iter_paginated_request,
+    make_request,
+)
+from rss.utils.rate_limit import AdaptiveRateLimiter
+
+ENTRIES_URL = "https://api.feedbin.com/v2/feeds/1/entries.json"
+UNREAD_URL = "https://api.feedbin.com/v2/unread_entries.json"
+PAGES = 3
+PAGE_SIZE = 2
+
+
+class FakeSession:
+    """Answers like Feedbin: every page has an ETag, and a matching If-None-Match gets a 304."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, dict[str, str]]] = []
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        headers = kwargs.get("headers") or {}
+        self.sent.append((url, headers))
+
+        page = int(parse_qs(urlsplit(url).query).get("page", ["1"])[0])
+        etag = f'"page-{page}"'
+        response = requests.Response()
+        response.url = url
+        response.headers["ETag"] = etag
+
+        if headers.get("If-None-Match") == etag:
+            response.status_code = 304
+            response._content = b""
+            return response
+
+        first_id = (page - 1) * PAGE_SIZE + 1
+        response.status_code = 200
+        response._content = json.dumps(
+            [{"id": id} for id in range(first_id, first_id + PAGE_SIZE)]
+        ).encode()
+        if page < PAGES:
+            base = url.split("?")[0]
+            response.headers["links"] = (
+                f'<{base}?page={page + 1}>; rel="next", <{base}?page={PAGES}>; rel="last"'
+            )
+        return response
+
+    def conditional_requests(self) -> int:
+        return sum("If-None-Match" in headers for _, headers in self.sent)
+
+
+@pytest.fixture
+def session(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FakeSession:
+    fake = FakeSession()
+    monkeypatch.delenv("NO_CACHE", raising=False)
+    monkeypatch.setattr(feedbin, "get_session", lambda: fake)
+    monkeypatch.setattr(
+        feedbin, "validator_cache", DiskCache("validators", cache_dir=str(tmp_path))
+    )
+    monkeypatch.setattr(
+        feedbin, "rate_limiter", AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=1000)
+    )
+    return fake
+
+
+def entry_ids(request_args: RequestArgs) -> list[int]:
+    return [entry["id"] for page in iter_paginated_request(request_args) for entry in page]
+
+
+class TestMakeRequest:
+    def test_a_304_returns_the_stored_200_response(_, session: FakeSession) -> None:
+        args = RequestArgs(url=ENTRIES_URL)
+
+        first = make_request(HTTPMethod.GET, args)
+        second = make_request(HTTPMethod.GET, args)
+
+        assert session.sent[1][1]["If-None-Match"] == '"page-1"'
+        assert is_revalidated(second)
+        assert second.status_code == 200
+        assert second.json() == first.json()
+
+    def test_other_endpoints_are_not_stored(_, session: FakeSession) -> None:
+        args = RequestArgs(url=UNREAD_URL)
+
+        make_request(HTTPMethod.GET, args)
+        second = make_request(HTTPMethod.GET, args)
+
+        assert session.conditional_requests() == 0
+        assert not is_revalidated(second)
+
+    def test_bodies_over_the_size_cap_are_not_stored(
+        _, session: FakeSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(feedbin, "MAX_STORED_BODY", 1)
+        args = RequestArgs(url=ENTRIES_URL)
+
+        make_request(HTTPMethod.GET, args)
+        make_request(HTTPMethod.GET, args)
+
+        assert session.conditional_requests() == 0
+
+
+class TestPaginatedReplay:
+    def test_unchanged_first_page_replays_the_stored_later_pages(_, session: FakeSession) -> None:
+        args = RequestArgs(url=ENTRIES_URL)
+        expected = list(range(1, PAGES * PAGE_SIZE + 1))
+
+        assert entry_ids(args) == expected
+        session.sent.clear()
+
+        assert entry_ids(args) == expected
+        assert [url for url, _ in session.sent] == [ENTRIES_URL]  # just the 304 for the first page
+
+    def test_a_missing_stored_page_is_downloaded_again(_, session: FakeSession) -> None:
+        args = RequestArgs(url=ENTRIES_URL)
+        expected = list(range(1, PAGES * PAGE_SIZE + 1))
+
+        assert entry_ids(args) == expected
+        feedbin.validator_cache.invalidate(cache_key(RequestArgs(url=f"{ENTRIES_URL}?page=2")))
+        session.sent.clear()
+
+        assert entry_ids(args) == expected
+        assert [url for url, _ in session.sent] == [ENTRIES_URL, f"{ENTRIES_URL}?page=2"]
@@ -0,0 +1,61 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+import requests
+
+from rss.utils import feedbin
+from rss.utils.feedbin import HTTPMethod, PoolConfig, RequestArgs, make_request
+from rss.utils.rate_limit import AdaptiveRateLimiter
+
+URL = "https://api.feedbin.com/v2/subscriptions/1.json"
+
+
+class SlowSession:
+    """Answers every request after a short delay, tracking the most requests in flight at once."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        with self._lock:
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+
+        time.sleep(0.02)
+
+        with self._lock:
+            self.in_flight -= 1
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"{}"
+        return response
+
+
+class TestConnectionSlots:
+    def test_requests_from_every_thread_share_the_pool_size_cap(
+        _, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        session = SlowSession()
+        monkeypatch.setattr(
+            feedbin, "rate_limiter", AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=1000)
+        )
+        feedbin.configure_session(PoolConfig(maxsize=3))
+        monkeypatch.setattr(feedbin, "get_session", lambda: session)
+
+        try:
+            with ThreadPoolExecutor(max_workers=12) as executor:
+                list(
+                    executor.map(
+                        lambda _i: make_request(HTTPMethod.GET, RequestArgs(url=URL)), range(24)
+                    )
+                )
+        finally:
+            feedbin.configure_session(PoolConfig())
+
+        assert session.most_in_flight == 3
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from rss.utils.metrics import LatencyHistogram
+
+MAX_RELATIVE_ERROR = 0.01
+
+
+def exact_percentile(values: list[int], percent: float) -> int:
+    ordered = sorted(values)
+    return ordered[max(1, round(len(ordered) * percent / 100)) - 1]
+
+
+class TestLatencyHistogram:
+    def test_every_value_lands_in_a_bucket_within_one_percent_of_it(_) -> None:
+        for value in [*range(1, 5_000), *range(5_000, 300_000_000, 9_973)]:
+            highest = LatencyHistogram._highest_in_bucket(LatencyHistogram._bucket(value))
+
+            assert value <= highest <= value * (1 + MAX_RELATIVE_ERROR)
+
+    @pytest.mark.parametrize("percent", [50, 95, 99, 100])
+    def test_percentiles_match_the_exact_values_to_within_one_percent(_, percent: float) -> None:
+        rng = random.Random(42)
+        values = [int(rng.lognormvariate(11, 1)) for _ in range(10_000)]  # ~60ms median, long tail
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        exact = exact_percentile(values, percent)
+
+        assert exact <= histogram.percentile(percent) <= exact * (1 + MAX_RELATIVE_ERROR)
+
+    def test_summary_values(_) -> None:
+        histogram = LatencyHistogram()
+        for value in [3, 1, 2]:
+            histogram.record(value)
+
+        assert (histogram.count, histogram.min, histogram.max, histogram.mean) == (3, 1, 3, 2.0)
+        assert histogram.percentile(50) == 2
+
+    def test_empty_histogram_reports_zero(_) -> None:
+        assert LatencyHistogram().percentile(99) == 0
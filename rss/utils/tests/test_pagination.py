@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from rss.utils import feedbin
+from rss.utils.feedbin import HTTPMethod, RequestArgs, iter_paginated_request
+
+URL = "https://api.feedbin.com/v2/feeds/1/entries.json"
+
+
+def make_response(
+    status_code: int, body: Any, headers: dict[str, str] | None = None
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode()
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeEntriesEndpoint:
+    """Serves `total` entries, page_size at a time, with Feedbin's "links" header (in place of make_request)."""
+
+    def __init__(
+        self,
+        total: int,
+        *,
+        page_size: int = 10,
+        failing_page: int | None = None,
+        send_last_link: bool = True,
+    ) -> None:
+        self.total = total
+        self.page_size = page_size
+        self.failing_page = failing_page
+        self.send_last_link = send_last_link
+        self.requested_pages: list[int] = []
+        self._lock = threading.Lock()
+
+    @property
+    def last_page(self) -> int:
+        return max(1, -(-self.total // self.page_size))
+
+    def __call__(self, method: HTTPMethod, args: RequestArgs) -> requests.Response:
+        page = int(parse_qs(urlsplit(args.url).query).get("page", ["1"])[0])
+        with self._lock:
+            self.requested_pages.append(page)
+
+        if page == self.failing_page:
+            response = make_response(500, {"status": 500})
+            raise requests.HTTPError("500 Server Error", response=response)
+
+        first_id = (page - 1) * self.page_size + 1
+        ids = range(first_id, min(self.total, page * self.page_size) + 1)
+        headers = {}
+        if page < self.last_page:
+            headers["links"] = f'<{URL}?page={page + 1}>; rel="next"'
+            if self.send_last_link:
+                headers["links"] += f', <{URL}?page={self.last_page}>; rel="last"'
+
+        return make_response(200, [{"id": id} for id in ids], headers)
+
+
+@pytest.fixture
+def endpoint(
+    monkeypatch: pytest.MonkeyPatch, request: pytest.FixtureRequest
+) -> FakeEntriesEndpoint:
+    fake = FakeEntriesEndpoint(**request.param)
+    monkeypatch.setattr(feedbin, "make_request", fake)
+    return fake
+
+
+def entry_ids(pages: list[list[dict[str, Any]]]) -> list[int]:
+    return [entry["id"] for page in pages for entry in page]
+
+
+class TestIterPaginatedRequest:
+    @pytest.mark.parametrize("endpoint", [{"total": 100}], indirect=True)
+    def test_reads_ahead_using_predicted_page_urls(_, endpoint: FakeEntriesEndpoint) -> None:
+        pages = iter_paginated_request(RequestArgs(url=URL), read_ahead=3)
+
+        next(pages)
+        deadline = time.monotonic() + 2
+        while len(endpoint.requested_pages) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # The first page, plus the next 3 requested at once before the first one is consumed
+        assert sorted(endpoint.requested_pages) == [1, 2, 3, 4]
+        assert entry_ids([*pages]) == list(range(11, 101))
+        assert sorted(endpoint.requested_pages) == list(range(1, 11))
+
+    @pytest.mark.parametrize("endpoint", [{"total": 25, "send_last_link": False}], indirect=True)
+    def test_stops_at_a_short_last_page(_, endpoint: FakeEntriesEndpoint) -> None:
+        pages = list(iter_paginated_request(RequestArgs(url=URL), read_ahead=3))
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert entry_ids(pages) == list(range(1, 26))
+        # Without a "last" link, up to read_ahead - 1 pages past the end may already be in flight (and are discarded)
+        assert max(endpoint.requested_pages) <= 3 + 2
+
+    @pytest.mark.parametrize("endpoint", [{"total": 50, "failing_page": 3}], indirect=True)
+    def test_raises_a_failed_page_to_the_consumer_after_the_pages_before_it(
+        _, endpoint: FakeEntriesEndpoint
+    ) -> None:
+        pages = iter_paginated_request(RequestArgs(url=URL), read_ahead=3)
+        received: list[list[dict[str, Any]]] = []
+
+        with pytest.raises(requests.HTTPError):
+            for page in pages:
+                received.append(page)
+
+        assert entry_ids(received) == list(range(1, 21))
@@ -0,0 +1,131 @@
+import time
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from rss.utils.rate_limit import (
+    BACKOFF_BASE,
+    BACKOFF_CAP,
+    RATE_INCREASE,
+    AdaptiveRateLimiter,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """A fake time.monotonic that tests move forward by hand (clock[0] is the current time)."""
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestAdaptiveRateLimiter:
+    def test_each_429_halves_the_rate_down_to_the_minimum(_) -> None:
+        limiter = AdaptiveRateLimiter(rate=8, min_rate=1.5)
+
+        limiter.on_throttled()
+        assert limiter.rate == 4
+        limiter.on_throttled()
+        limiter.on_throttled()
+        assert limiter.rate == 1.5
+
+    def test_the_rate_recovers_by_a_fixed_amount_per_second_not_per_request(
+        _, clock: list[float]
+    ) -> None:
+        limiter = AdaptiveRateLimiter(rate=20, max_rate=20)
+        limiter.on_throttled()
+
+        for _i in range(50):  # a burst of successes within the same second
+            clock[0] += 0.01
+            limiter.on_success()
+        assert limiter.rate == pytest.approx(10 + 0.5 * RATE_INCREASE)
+
+        for _i in range(5):  # then one success a second
+            clock[0] += 1
+            limiter.on_success()
+        assert limiter.rate == pytest.approx(10 + 5.5 * RATE_INCREASE)
+
+    def test_a_quiet_period_adds_at_most_one_second_of_increase(_, clock: list[float]) -> None:
+        limiter = AdaptiveRateLimiter(rate=5, max_rate=20)
+
+        clock[0] += 60
+        limiter.on_success()
+
+        assert limiter.rate == 5 + RATE_INCREASE
+
+    def test_recovery_waits_for_retry_after_and_stops_at_max_rate(_, clock: list[float]) -> None:
+        limiter = AdaptiveRateLimiter(rate=20, max_rate=20)
+        limiter.on_throttled(retry_after=5)
+
+        clock[0] += 5
+        limiter.on_success()
+        assert limiter.rate == 10
+
+        for _i in range(30):
+            clock[0] += 1
+            limiter.on_success()
+        assert limiter.rate == 20
+
+    def test_retry_after_holds_every_caller_back(_, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = 100.0
+        sleeps: list[float] = []
+
+        def sleep(seconds: float) -> None:
+            nonlocal now
+            sleeps.append(seconds)
+            now += seconds
+
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        monkeypatch.setattr(time, "sleep", sleep)
+        limiter = AdaptiveRateLimiter(rate=10, burst=10)
+
+        limiter.on_throttled(retry_after=5)
+        limiter.acquire()
+
+        assert now >= 105
+        assert sum(sleeps) >= 5
+
+
+class TestBackoffDelay:
+    @pytest.mark.parametrize("attempt", range(10))
+    def test_full_jitter_stays_within_the_exponential_cap(_, attempt: int) -> None:
+        ceiling = min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt)
+
+        delays = [backoff_delay(attempt) for _ in range(200)]
+
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert len(set(delays)) > 1  # jittered, not fixed
+
+    def test_retry_after_wins(_) -> None:
+        assert backoff_delay(3, retry_after=7) == 7
+
+
+def http_date(moment: datetime) -> str:
+    return format_datetime(moment, usegmt=True)
+
+
+class TestParseRetryAfter:
+    @pytest.mark.parametrize("value, expected", [("120", 120), ("0", 0), ("-5", 0), ("1.5", 1.5)])
+    def test_seconds(_, value: str, expected: float) -> None:
+        assert parse_retry_after(value) == expected
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "Mon, 99 Foo 2024"])
+    def test_missing_or_invalid(_, value: str | None) -> None:
+        assert parse_retry_after(value) is None
+
+    def test_http_date(_) -> None:
+        value = http_date(datetime.now(UTC) + timedelta(seconds=60))
+
+        assert 55 <= (parse_retry_after(value) or 0) <= 60
+
+    def test_http_date_without_a_timezone_is_read_as_gmt(_) -> None:
+        in_a_minute = datetime.now(UTC) + timedelta(seconds=60)
+        value = in_a_minute.strftime("%a, %d %b %Y %H:%M:%S -0000")  # parses as a naive datetime
+
+        assert 55 <= (parse_retry_after(value) or 0) <= 60
+
+    def test_http_date_in_the_past(_) -> None:
+        assert parse_retry_after(http_date(datetime.now(UTC) - timedelta(hours=1))) == 0
@@ -0,0 +1,104 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from rss.utils import feedbin
+from rss.utils.feedbin import HTTPMethod, RequestArgs, make_request
+from rss.utils.rate_limit import AdaptiveRateLimiter
+
+URL = "https://api.feedbin.com/v2/subscriptions.json"
+
+Outcome = int | tuple[int, dict[str, str]] | Exception
+
+
+class ScriptedSession:
+    """Answers each request with the next scripted status code (and headers), or raises the next exception."""
+
+    def __init__(self, *outcomes: Outcome) -> None:
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        outcome = self.outcomes[self.calls]
+        self.calls += 1
+
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        status_code, headers = outcome if isinstance(outcome, tuple) else (outcome, {})
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = url
+        response._content = b"{}"
+        response.headers.update(headers)
+        return response
+
+
+@pytest.fixture
+def script(monkeypatch: pytest.MonkeyPatch) -> Callable[..., ScriptedSession]:
+    monkeypatch.setattr(
+        feedbin, "rate_limiter", AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=1000)
+    )
+    monkeypatch.setattr(feedbin, "backoff_delay", lambda attempt, retry_after=None: 0)
+
+    def use(*outcomes: Outcome) -> ScriptedSession:
+        session = ScriptedSession(*outcomes)
+        monkeypatch.setattr(feedbin, "get_session", lambda: session)
+        return session
+
+    return use
+
+
+def refused() -> requests.ConnectionError:
+    reason = NewConnectionError(None, "Connection refused")  # type: ignore[arg-type]
+    return requests.ConnectionError(MaxRetryError(None, URL, reason))  # type: ignore[arg-type]
+
+
+class TestRetries:
+    @pytest.mark.parametrize("method", [HTTPMethod.GET, HTTPMethod.PATCH, HTTPMethod.DELETE])
+    def test_idempotent_requests_are_retried_after_5xx_and_timeouts(
+        _, script: Callable[..., ScriptedSession], method: HTTPMethod
+    ) -> None:
+        session = script(503, requests.ReadTimeout(), 200)
+
+        assert make_request(method, RequestArgs(url=URL)).status_code == 200
+        assert session.calls == 3
+
+    def test_posts_are_not_retried_after_a_5xx(_, script: Callable[..., ScriptedSession]) -> None:
+        session = script(503, 201)
+
+        with pytest.raises(requests.HTTPError):
+            make_request(HTTPMethod.POST, RequestArgs(url=URL))
+        assert session.calls == 1
+
+    def test_posts_are_not_retried_after_a_read_timeout(
+        _, script: Callable[..., ScriptedSession]
+    ) -> None:
+        session = script(requests.ReadTimeout(), 201)
+
+        with pytest.raises(requests.ReadTimeout):
+            make_request(HTTPMethod.POST, RequestArgs(url=URL))
+        assert session.calls == 1
+
+    def test_posts_are_not_retried_after_a_429_without_retry_after(
+        _, script: Callable[..., ScriptedSession]
+    ) -> None:
+        session = script(429, 201)
+
+        with pytest.raises(requests.HTTPError):
+            make_request(HTTPMethod.POST, RequestArgs(url=URL))
+        assert session.calls == 1
+
+    @pytest.mark.parametrize(
+        "failure", [(429, {"Retry-After": "0"}), requests.ConnectTimeout(), refused()]
+    )
+    def test_posts_are_retried_when_the_server_never_acted_on_them(
+        _, script: Callable[..., ScriptedSession], failure: Outcome
+    ) -> None:
+        session = script(failure, 201)
+
+        assert make_request(HTTPMethod.POST, RequestArgs(url=URL)).status_code == 201
+        assert session.calls == 2
@@ -0,0 +1,39 @@
+import time
+from typing import cast
+
+import pytest
+from gspread.worksheet import Worksheet
+
+from benchmarks.fake_sheets import FakeWorksheet
+from rss.utils.sheets import SheetWriteBuffer
+
+
+def make_sheet(write_quota: int = 60) -> FakeWorksheet:
+    return FakeWorksheet([["A", "B"]], write_quota=write_quota)
+
+
+class TestSheetWriteBuffer:
+    def test_timer_flushes_pending_writes(_) -> None:
+        sheet = make_sheet()
+
+        with SheetWriteBuffer(cast(Worksheet, sheet), flush_interval=0.01) as writes:
+            writes.write("A2:B2", [["1", "2"]])
+
+            deadline = time.monotonic() + 2
+            while sheet.stats.write_requests == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert sheet.stats.write_requests == 1
+            assert sheet.values[1] == ["1", "2"]
+
+        assert sheet.stats.write_requests == 1  # nothing left to write on close
+
+    def test_failed_flush_on_exit_does_not_replace_the_original_error(_) -> None:
+        sheet = make_sheet(write_quota=0)  # every write fails with a 429
+
+        with pytest.raises(ValueError, match="original"):
+            with SheetWriteBuffer(cast(Worksheet, sheet), flush_interval=60) as writes:
+                writes.write("A2:B2", [["1", "2"]])
+                raise ValueError("original")
+
+        assert sheet.stats.throttled_requests == 1